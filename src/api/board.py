@@ -1,21 +1,21 @@
 from fastapi import APIRouter, Form, UploadFile, Depends, Query
-from typing import List
 
 from core.di import get_board_service
-from schema.response import BoardDetailResponse, BoardSummaryResponse
+from schema.response import BoardDetailResponse, BoardListResponse, CommentListResponse
 from service.board_service import BoardService
 
 router = APIRouter(prefix="/board", tags=["Board"])
 
-@router.get("/list", response_model=List[BoardSummaryResponse])
+@router.get("/list", response_model=BoardListResponse)
 async def get_all_boards(
-        skip: int = Query(0, ge=0),
-        limit: int = Query(10, ge=1),
+        cursor: str | None = None,
+        limit: int = Query(10, ge=1, le=50),
         title: str | None = None,
         nickname: str | None = None,
         board_service: BoardService = Depends(get_board_service)
 ):
-    return await board_service.get_all_boards(skip=skip, limit=limit, title=title, nickname=nickname)
+    return await board_service.get_all_boards(limit=limit, cursor=cursor, title=title, nickname=nickname)
+
 @router.post("", status_code=201)
 async def create_board(
         title: str = Form(...),
@@ -46,6 +46,20 @@ async def like_board(
 ):
     return await board_service.like_board(board_id)
 
+@router.put("/{board_id}/like", status_code=204)    # 멱등 추천
+async def add_like(
+    board_id: int,
+    board_service: BoardService = Depends(get_board_service)
+):
+    await board_service.add_like(board_id)
+
+@router.delete("/{board_id}/like", status_code=204)     # 멱등 추천 취소
+async def remove_like(
+    board_id: int,
+    board_service: BoardService = Depends(get_board_service)
+):
+    await board_service.remove_like(board_id)
+
 @router.post("/{board_id}/comment", status_code=201)
 async def create_comment(
     board_id: int,
@@ -54,12 +68,14 @@ async def create_comment(
 ):
     return await board_service.create_comment(board_id, comment)
 
-@router.get("/{board_id}/comments", status_code=200)
+@router.get("/{board_id}/comments", status_code=200, response_model=CommentListResponse)
 async def get_comments(
     board_id: int,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
     board_service: BoardService = Depends(get_board_service)
 ):
-    return await board_service.get_comments(board_id)
+    return await board_service.get_comments(board_id, limit=limit, cursor=cursor)
 
 @router.delete("/comment/{comment_id}", status_code=204)
 async def delete_comment(
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 
 from core.di import get_foodthing_service, get_recipe_management_service
+from database.repository.recipe_repository import RankingWindow
 from schema.request import FoodCookRequest, IngredientCookRequest, FoodOnlyRequest, RecipeRequest
+from schema.response import SavedRecipeListResponse
 from service.recipe_service import FoodThingAIService, RecipeManagementService
 
 router = APIRouter(prefix="/recipe", tags=["Recipe"])
@@ -47,11 +49,26 @@ async def save_recipe(
 ):
     return await recipe_service.save_recipe(request.dict())
 
-@router.get("/like", status_code=200)   # 레시피 불러오기
+@router.get("/like", status_code=200)   # 레시피 불러오기 (DB 의 JSON 을 그대로 전달)
 async def get_saved_recipe(
     recipe_service: RecipeManagementService = Depends(get_recipe_management_service)
 ):
-    return await recipe_service.get_saved_recipes()
+    return Response(content=await recipe_service.get_saved_recipes(), media_type="application/json")
+
+@router.get("/like/summary", status_code=200, response_model=SavedRecipeListResponse)   # 저장된 레시피 목록 (요약)
+async def get_saved_recipe_summaries(
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    recipe_service: RecipeManagementService = Depends(get_recipe_management_service)
+):
+    return await recipe_service.get_saved_recipe_summaries(limit=limit, cursor=cursor)
+
+@router.get("/like/{recipe_id}", status_code=200)   # 저장된 레시피 상세
+async def get_saved_recipe_detail(
+    recipe_id: int,
+    recipe_service: RecipeManagementService = Depends(get_recipe_management_service)
+):
+    return Response(content=await recipe_service.get_saved_recipe(recipe_id), media_type="application/json")
 
 @router.patch("/like/{recipe_id}", status_code=204) # 저장된 레시피 삭제(소프트 삭제)
 async def delete_saved_recipe(
@@ -64,9 +81,10 @@ async def delete_saved_recipe(
 레시피 랭킹 관련 라우터
 """
 
-@router.get("/ranking", status_code=200)
+@router.get("/ranking", status_code=200)    # window: daily(오늘), weekly(최근 7일), all(전체)
 async def recipe_ranking(
     recipe_service: RecipeManagementService = Depends(get_recipe_management_service),
-    limit: int = 20
+    limit: int = Query(20, ge=1, le=100),
+    window: RankingWindow = "all"
 ):
-    return await recipe_service.get_food_ranking(limit)
\ No newline at end of file
+    return await recipe_service.get_food_ranking(limit, window)
\ No newline at end of file
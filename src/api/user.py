@@ -1,42 +1,60 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Query
+from pydantic import EmailStr
 
 from schema.request import SignUpRequest, LogInRequest, PassWordChangeRequest, FindIdRequest
+from schema.response import AvailabilityResponse
 from service.user_service import UserService
-from core.di import get_user_service
-from service.auth.jwt_handler import get_access_token
+from core.di import get_user_service, get_current_principal, auth_rate_limit
+from service.auth.principal import Principal
+from service.auth.rate_limiter import AuthThrottle
 
 router = APIRouter(prefix="/users", tags=["User"])
 
+@router.get("/availability", status_code=200, response_model=AvailabilityResponse, response_model_exclude_none=True)
+async def user_availability(
+        email: EmailStr | None = Query(None),
+        nickname: str | None = Query(None, min_length=2, max_length=20),
+        throttle: AuthThrottle = Depends(auth_rate_limit("availability")),
+        user_service: UserService = Depends(get_user_service),
+):
+    return await user_service.check_availability(email, nickname)
+
 @router.post("/sign-up", status_code=201)
 async def user_sign_up(
         request: SignUpRequest,
+        throttle: AuthThrottle = Depends(auth_rate_limit("sign-up")),
         user_service: UserService = Depends(get_user_service),
 ):
+    await throttle.check_account(request.email)
     return await user_service.sign_up(request)
 
 @router.post("/log-in", status_code=200)
 async def user_log_in(
         request: LogInRequest,
         req: Request,
+        throttle: AuthThrottle = Depends(auth_rate_limit("log-in")),
         user_service: UserService = Depends(get_user_service),
 ):
+    await throttle.check_account(request.email)
     return await user_service.log_in(request, req)
 
 @router.patch("/change-pw", status_code=204)
 async def user_change_pw(
         request: PassWordChangeRequest,
-        access_token: str = Depends(get_access_token),
-        req: Request = None,
+        current_user: Principal = Depends(get_current_principal),
+        throttle: AuthThrottle = Depends(auth_rate_limit("change-pw")),
         user_service: UserService = Depends(get_user_service),
 ):
-    current_user = await user_service.get_user_by_token(access_token, req)
+    await throttle.check_account(str(current_user.id))
     await user_service.change_password(current_user, request)
 
 
 @router.post("/find-id", status_code=200)
 async def user_find_id(
         request: FindIdRequest,
+        throttle: AuthThrottle = Depends(auth_rate_limit("find-id")),
         user_service: UserService = Depends(get_user_service),
 ):
+    await throttle.check_account(request.phone_num)
     email = await user_service.find_id(request)
     return {"email": email}
\ No newline at end of file
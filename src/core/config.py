@@ -17,6 +17,10 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_DB: int = 0
+    REDIS_MAX_CONNECTIONS: int = 50             # 프로세스당 Redis 연결 최대 개수
+    REDIS_POOL_TIMEOUT_SECONDS: float = 2       # 연결이 모두 사용 중일 때 기다리는 최대 시간
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 1     # 명령/연결 타임아웃 (Redis 장애 시 빨리 포기하고 기본 동작으로)
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = 30   # 이 시간 이상 쉰 연결은 사용 전에 PING
 
     NAVER_CLIENT_ID: str
     NAVER_CLIENT_SECRET: SecretStr
@@ -38,6 +42,33 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: SecretStr
     AWS_BUCKET_NAME: str
 
+    SOCIAL_HTTP_TIMEOUT_SECONDS: float = 5          # 소셜 로그인 제공자 API 요청 타임아웃
+    SOCIAL_HTTP_CONNECT_TIMEOUT_SECONDS: float = 3
+    SOCIAL_HTTP_MAX_CONNECTIONS: int = 20           # 제공자별 최대 연결 수 (keep-alive 포함)
+    SOCIAL_HTTP_KEEPALIVE_SECONDS: float = 60       # 쉬고 있는 연결 유지 시간
+
+    FOOD_RANKING_FLUSH_INTERVAL_MS: int = 1000   # 음식 랭킹 이벤트 반영 주기
+    FOOD_RANKING_FLUSH_MAX_EVENTS: int = 500     # 이 개수 이상 쌓이면 주기 전에 반영
+
+    LIKE_COUNTER_SHARDS: int = 16               # 게시글당 추천 수 샤드 개수
+    LIKE_COUNTER_FOLD_INTERVAL_MS: int = 5000   # 샤드 증감을 board.like_count 에 반영하는 주기
+
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30       # 인증 사용자 캐시 유지 시간 (다른 서버의 변경은 최대 이 시간만큼 늦게 반영)
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000       # 프로세스 내 캐시 최대 개수
+
+    BCRYPT_MAX_WORKERS: int = 4                 # bcrypt 전용 스레드 수 (동시에 해싱하는 최대 개수)
+
+    JWT_CACHE_MAX_SIZE: int = 10000             # 서명 검증이 끝난 토큰 캐시 최대 개수
+
+    USER_BLOOM_CAPACITY: int = 1000000          # 가입 중복 확인 블룸 필터 크기 (사용자 수보다 넉넉하게, 바꾸면 user_bloom:* 삭제 후 재기동)
+    USER_BLOOM_ERROR_RATE: float = 0.01         # 오탐률 (오탐이면 DB 로 확인)
+
+    AUTH_RATE_LIMIT_WINDOW_SECONDS: int = 60    # 인증 요청 제한 윈도우
+    AUTH_RATE_LIMIT_PER_IP: int = 20            # 윈도우 안에서 IP 하나당 최대 요청 수 (엔드포인트별)
+    AUTH_RATE_LIMIT_PER_ACCOUNT: int = 5        # 윈도우 안에서 계정 하나당 최대 요청 수 (엔드포인트별)
+
+    METRICS_TOKEN: SecretStr | None = None      # /metrics 조회용 토큰 (Authorization: Bearer, 없으면 /metrics 비활성화)
+
     ENV: Literal["dev", "prod", "test"] = "dev"
 
     class Config:
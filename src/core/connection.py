@@ -1,32 +1,125 @@
+import json
+import logging
+import time
+
 import aioredis
 
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker
 from core.config import settings
+from core.metrics import metrics
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
+from database.repository.base_repository import unit_of_work
+
+logger = logging.getLogger(__name__)
+
+REDIS_RETRY_SECONDS = 30    # Redis 오류 후 이 시간 동안은 Redis 를 건너뜀
+
 POSTGRES_DATABASE_URL = settings.POSTGRES_DATABASE_URL
-postgres_engine = create_async_engine(POSTGRES_DATABASE_URL)
+postgres_engine = create_async_engine(
+    POSTGRES_DATABASE_URL,
+    json_serializer=lambda obj: json.dumps(obj, ensure_ascii=False)     # 한글을 \uXXXX 로 이스케이프하지 않음
+)
 AsyncSessionLocal = sessionmaker(
     bind=postgres_engine,
     expire_on_commit=False,
     class_=AsyncSession
 )
 
+
+def count_connection_checkouts(engine):     # 풀에서 실제로 커넥션을 꺼낸/반납한 횟수 (/metrics)
+    # 세션은 첫 쿼리 때 커넥션을 꺼내므로, 쿼리 없이 끝나는 요청은 커넥션을 잡지 않음
+    event.listen(engine.sync_engine.pool, "checkout", lambda *args: metrics.inc("db_connection_checkout"))
+    event.listen(engine.sync_engine.pool, "checkin", lambda *args: metrics.inc("db_connection_checkin"))
+
+count_connection_checkouts(postgres_engine)
+
 async def get_postgres_db():
-    async with AsyncSessionLocal() as session:
+    async with AsyncSessionLocal() as session, unit_of_work(session):
         yield session
 
+class TimedPipeline(aioredis.client.Pipeline):
+
+    async def execute(self, raise_on_error: bool = True):
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            metrics.observe("redis_pipeline_seconds", time.perf_counter() - start)
+
+
+class TimedRedis(aioredis.Redis):   # 명령별 소요 시간을 metrics 에 기록 (redis_<명령>_seconds)
+
+    async def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            metrics.observe(f"redis_{str(args[0]).lower()}_seconds", time.perf_counter() - start)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> TimedPipeline:
+        return TimedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
 class RedisClient:
-    _redis = None
+    _redis: TimedRedis | None = None
 
     @classmethod
-    async def get_redis(cls):
+    def _create(cls) -> TimedRedis:     # 연결은 실제 명령 시점에 맺으므로 await 없이 생성
+        pool = aioredis.BlockingConnectionPool(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT_SECONDS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+            decode_responses=True,
+        )
+        return TimedRedis(connection_pool=pool)
+
+    @classmethod
+    async def get_redis(cls) -> TimedRedis:
+        # 확인과 생성 사이에 await 가 없어서 동시에 처음 호출해도 클라이언트는 하나만 생성됨
         if cls._redis is None:
-            cls._redis = await aioredis.from_url(f"redis://{settings.REDIS_HOST}", decode_responses=True)
+            cls._redis = cls._create()
         return cls._redis
 
+    @classmethod
+    async def init_redis(cls) -> bool:  # 기동 시 호출, Redis 가 없어도 서버는 기동 (각 기능이 기본 동작으로 처리)
+        redis = await cls.get_redis()
+        try:
+            await redis.ping()
+            return True
+        except Exception:
+            logger.warning(f"[RedisClient] {settings.REDIS_HOST}:{settings.REDIS_PORT} 연결 실패")
+            return False
+
     @classmethod
     async def close_redis(cls):
         if cls._redis:
-            await cls._redis.close()
-            cls._redis = None
+            redis, cls._redis = cls._redis, None
+            await redis.close()
+            await redis.connection_pool.disconnect()
+
+
+class RedisBacked:     # Redis 를 쓰되, Redis 장애 시 잠시 건너뛰고 기본 동작으로 처리
+
+    def __init__(self, redis_getter=RedisClient.get_redis):
+        self.redis_getter = redis_getter
+        self._redis_retry_at = 0.0
+
+    async def _redis(self):
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        try:
+            return await self.redis_getter()
+        except Exception:
+            self._redis_unavailable()
+            return None
+
+    def _redis_unavailable(self):
+        logger.warning(f"[{type(self).__name__}] Redis 사용 불가, {REDIS_RETRY_SECONDS}초 동안 건너뜀")
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
@@ -1,8 +1,19 @@
-from fastapi import Depends, Request
+import hmac
+
+from fastapi import Depends, Header, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import TypeVar, Type, Callable
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from core.config import settings
 
 from database.repository.recipe_repository import RecipeRepository
+from service.food_ranking_buffer import FoodRankingBuffer, food_ranking_buffer
+from service.auth.principal import Principal, PrincipalCache, TokenVersionStore, principal_cache, token_version_store
+from service.auth.rate_limiter import AuthThrottle, rate_limiter
+from service.user_availability import UserAvailability, user_availability
+from service.auth.token_cache import VerifiedTokenCache, verified_token_cache
+from service.auth.oauth_http import OAuthHttpClients, oauth_http_clients
 from src.core.connection import get_postgres_db
 from src.database.repository.board_repository import BoardRepository
 from src.database.repository.ingredient_repository import IngredientRepository
@@ -31,9 +42,59 @@ def get_board_repo(session: AsyncSession = Depends(get_postgres_db)) -> BoardRep
 def get_recipe_repository(session: AsyncSession = Depends(get_postgres_db)) -> RecipeRepository:
     return RecipeRepository(session)
 
+def get_food_ranking_buffer() -> FoodRankingBuffer:
+    return food_ranking_buffer
+
+def get_principal_cache() -> PrincipalCache:
+    return principal_cache
+
+def get_token_version_store() -> TokenVersionStore:
+    return token_version_store
+
+def get_rate_limiter():
+    return rate_limiter
+
+def get_user_availability() -> UserAvailability:
+    return user_availability
+
+def get_verified_token_cache() -> VerifiedTokenCache:
+    return verified_token_cache
+
+def get_oauth_http_clients() -> OAuthHttpClients:
+    return oauth_http_clients
+
 # ------------------- 서비스 관련 DI -------------------
-def get_user_service(user_repo: UserRepository = Depends(get_user_repo)) -> UserService:
-    return UserService(user_repo)
+def get_user_service(
+    user_repo: UserRepository = Depends(get_user_repo),
+    principal_cache: PrincipalCache = Depends(get_principal_cache),
+    token_versions: TokenVersionStore = Depends(get_token_version_store),
+    availability: UserAvailability = Depends(get_user_availability),
+    token_cache: VerifiedTokenCache = Depends(get_verified_token_cache),
+) -> UserService:
+    return UserService(user_repo, principal_cache=principal_cache, token_versions=token_versions,
+                       availability=availability, token_cache=token_cache)
+
+# ------------------- 인증 관련 DI -------------------
+async def get_current_principal(
+    req: Request,
+    access_token: str = Depends(get_access_token),
+    user_service: UserService = Depends(get_user_service),
+) -> Principal:     # 토큰 버전 확인 후 캐시된 인증 사용자 (상태 확인 포함)
+    return await user_service.get_user_by_token(access_token, req)
+
+def verify_metrics_token(authorization: str | None = Header(None)):
+    # 내부 모니터링만 조회 가능 (토큰이 없거나 다르면 없는 경로처럼 404)
+    token = settings.METRICS_TOKEN
+    expected = f"Bearer {token.get_secret_value()}" if token is not None else None
+    if expected is None or authorization is None or not hmac.compare_digest(authorization.encode(), expected.encode()):
+        raise StarletteHTTPException(status_code=404)
+
+def auth_rate_limit(action: str) -> Callable:     # IP 단위 제한은 여기서, 계정 단위는 라우터에서 check_account
+    async def dependency(req: Request, limiter=Depends(get_rate_limiter)) -> AuthThrottle:
+        throttle = AuthThrottle(limiter, action)
+        await throttle.check_ip(req.client.host if req.client else None)
+        return throttle
+    return dependency
 
 def get_ingredient_service(
     req: Request,
@@ -70,14 +131,14 @@ def get_foodthing_service(
     user_service: UserService = Depends(get_user_service),
     user_repo: UserRepository = Depends(get_user_repo),
     access_token: str = Depends(get_access_token),
-    recipe_repo: RecipeRepository = Depends(get_recipe_repository),
+    ranking_buffer: FoodRankingBuffer = Depends(get_food_ranking_buffer),
 ) -> FoodThingAIService:
     return FoodThingAIService(
         user_service=user_service,
         user_repo=user_repo,
         access_token=access_token,
         req=request,
-        recipe_repo=recipe_repo
+        ranking_buffer=ranking_buffer
     )
 
 def get_recipe_management_service(
@@ -85,12 +146,14 @@ def get_recipe_management_service(
     recipe_repo: RecipeRepository = Depends(get_recipe_repository),
     user_service: UserService = Depends(get_user_service),
     access_token: str = Depends(get_access_token),
+    ranking_buffer: FoodRankingBuffer = Depends(get_food_ranking_buffer),
 ) -> RecipeManagementService:
     return RecipeManagementService(
         recipe_repo=recipe_repo,
         user_service=user_service,
         access_token=access_token,
-        req=request
+        req=request,
+        ranking_buffer=ranking_buffer
     )
 
 
@@ -99,12 +162,13 @@ T = TypeVar("T")
 
 def create_auth_service_dependency(
     service_class: Type[T],
-) -> Callable[[UserService, UserRepository], T]:
+) -> Callable[[UserService, UserRepository, OAuthHttpClients], T]:
     def dependency(
         user_service: UserService = Depends(get_user_service),
         user_repo: UserRepository = Depends(get_user_repo),
+        http_clients: OAuthHttpClients = Depends(get_oauth_http_clients),
     ) -> T:
-        return service_class(user_service, user_repo)
+        return service_class(user_service, user_repo, http_clients)
 
     return dependency
 
@@ -0,0 +1,38 @@
+from collections import defaultdict
+from threading import Lock
+
+# 프로세스 내 간단한 지표 저장소 (GET /metrics 로 조회)
+
+
+class Metrics:
+
+    def __init__(self):
+        self._lock = Lock()     # 스레드 풀(bcrypt 등)에서도 기록하므로
+        self._counters: dict[str, int] = defaultdict(int)
+        self._timings: dict[str, dict[str, float]] = {}
+
+    def inc(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] += value
+
+    def observe(self, name: str, seconds: float):    # 소요 시간 기록 (count/sum/max)
+        with self._lock:
+            timing = self._timings.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+            timing["count"] += 1
+            timing["sum"] += seconds
+            timing["max"] = max(timing["max"], seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "timings": {name: dict(timing) for name, timing in self._timings.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+
+metrics = Metrics()
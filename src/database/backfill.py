@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import sys
+
+from sqlalchemy import inspect, text
+
+from core.connection import AsyncSessionLocal, postgres_engine
+from database.orm import RecipeContent
+from database.repository.board_repository import BoardRepository
+from database.repository.recipe_repository import RecipeRepository
+
+# 배포 후 한 번만 실행하는 데이터 보정 (서버 기동과 분리, 여러 번 실행해도 결과는 같음)
+# 사용법: PYTHONPATH=src python -m database.backfill [comment_counts recipe_contents ...]   (이름을 생략하면 전체 실행)
+
+logger = logging.getLogger(__name__)
+
+
+async def backfill_comment_counts() -> int:    # comment_count 컬럼 추가 이전 게시글의 댓글 수
+    async with AsyncSessionLocal() as session:
+        return await BoardRepository(session).backfill_comment_counts()
+
+
+# 본문 이전 후 like_recipe 를 orm.LikeRecipe 형태로 맞춤 (운영 postgres)
+FINISH_RECIPE_CONTENTS = (
+    "ALTER TABLE like_recipe ALTER COLUMN content_hash SET NOT NULL",
+    "ALTER TABLE like_recipe ADD CONSTRAINT like_recipe_content_hash_fkey "
+    "FOREIGN KEY (content_hash) REFERENCES recipe_content (content_hash)",
+    "ALTER TABLE like_recipe ADD CONSTRAINT uq_like_recipe_user_content UNIQUE (user_id, content_hash)",
+    "ALTER TABLE like_recipe DROP COLUMN recipe, DROP COLUMN IF EXISTS food_name, DROP COLUMN IF EXISTS ingredient_names",
+)
+
+
+def _has_legacy_recipe_column(sync_conn) -> bool:
+    return "recipe" in {c["name"] for c in inspect(sync_conn).get_columns("like_recipe")}
+
+
+async def backfill_recipe_contents() -> int:   # like_recipe.recipe -> recipe_content (이전 버전 서버를 내린 뒤, 새 버전 기동 전에 실행)
+    async with postgres_engine.begin() as conn:
+        if not await conn.run_sync(_has_legacy_recipe_column):     # 이미 이전 완료
+            return 0
+        await conn.run_sync(RecipeContent.__table__.create, checkfirst=True)
+        await conn.execute(text("ALTER TABLE like_recipe ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)"))
+
+    async with AsyncSessionLocal() as session:
+        moved = await RecipeRepository(session).backfill_recipe_contents()
+
+    async with postgres_engine.begin() as conn:
+        for statement in FINISH_RECIPE_CONTENTS:
+            await conn.execute(text(statement))
+    return moved
+
+
+BACKFILLS = {
+    "comment_counts": backfill_comment_counts,
+    "recipe_contents": backfill_recipe_contents,
+}
+
+
+async def main(names: list[str]):
+    try:
+        for name in names:
+            fixed = await BACKFILLS[name]()
+            logger.info(f"[backfill] {name}: {fixed}건 보정")
+    finally:
+        await postgres_engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(sys.argv[1:] or list(BACKFILLS)))
@@ -1,7 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Enum, text, TIMESTAMP, Text, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Enum, text, TIMESTAMP, Text, Boolean, Index, JSON, \
+    UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base, relationship
 
-Base = declarative_base()
+class _EagerDefaults:
+    # INSERT 시 서버 기본값(id, created_at, status 등)을 RETURNING 으로 같이 받아옴 -> refresh 조회 불필요
+    __mapper_args__ = {"eager_defaults": True}
+
+Base = declarative_base(cls=_EagerDefaults)
 
 class User(Base):
     __tablename__ = "users"
@@ -70,6 +76,7 @@ class Board(Base):
     title = Column(String(40), nullable=False)
     content = Column(Text, nullable=False)
     like_count = Column(Integer, nullable=False, server_default=text("0"))
+    comment_count = Column(Integer, nullable=False, server_default=text("0"))     # 삭제되지 않은 댓글 수 (댓글 작성/삭제 시 갱신)
     status = Column(Boolean, nullable=False, server_default=text("TRUE"))
     exist_image = Column(Boolean, nullable=False, server_default=text("FALSE"))
     created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False)
@@ -78,6 +85,15 @@ class Board(Base):
     comments = relationship("BoardComment", back_populates="board", cascade="all, delete-orphan")
     likes = relationship("BoardLike", back_populates="board", cascade="all, delete-orphan")
     images = relationship("BoardImage", back_populates="board", cascade="all, delete-orphan")
+    search_tokens = relationship("BoardSearchToken", back_populates="board", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # 게시글 목록 키셋 페이지네이션 (created_at DESC, id DESC)
+        Index(
+            "ix_board_active_created_at_id", "created_at", "id",
+            postgresql_where=text("status"), sqlite_where=text("status")
+        ),
+    )
 
 class BoardComment(Base):
     __tablename__ = "board_comment"
@@ -92,6 +108,14 @@ class BoardComment(Base):
     user = relationship("User", back_populates="board_comments")
     board = relationship("Board", back_populates="comments")
 
+    __table_args__ = (
+        # 게시글별 댓글 키셋 페이지네이션 (created_at, id)
+        Index(
+            "ix_board_comment_active_board_created_at_id", "board_id", "created_at", "id",
+            postgresql_where=text("status"), sqlite_where=text("status")
+        ),
+    )
+
 class BoardLike(Base):
     __tablename__ = "board_like"
 
@@ -102,6 +126,13 @@ class BoardLike(Base):
     user = relationship("User", back_populates="board_likes")
     board = relationship("Board", back_populates="likes")
 
+class BoardLikeCounterShard(Base):     # 추천 수 증감을 여러 행에 나눠 기록 (인기글 board 행 락 경합 방지)
+    __tablename__ = "board_like_counter_shard"
+
+    board_id = Column(Integer, ForeignKey("board.id", ondelete="CASCADE"), primary_key=True, nullable=False)
+    shard = Column(Integer, primary_key=True, nullable=False)
+    delta = Column(Integer, default=0, nullable=False)     # board.like_count 에 아직 반영되지 않은 증감
+
 class BoardImage(Base):
     __tablename__ = "board_image"
 
@@ -112,20 +143,75 @@ class BoardImage(Base):
 
     board = relationship("Board", back_populates="images")
 
+class BoardSearchToken(Base):   # 게시글 검색용 역색인 (제목/작성자 닉네임 바이그램)
+    __tablename__ = "board_search_token"
+
+    field = Column(Enum("title", "nickname", name="board_search_field"), primary_key=True)
+    token = Column(String(4), primary_key=True)
+    board_id = Column(Integer, ForeignKey("board.id", ondelete="CASCADE"), primary_key=True)
+
+    board = relationship("Board", back_populates="search_tokens")
+
+    __table_args__ = (
+        Index("ix_board_search_token_board_id", "board_id"),
+    )
+
+class RecipeContent(Base):     # 레시피 본문 (내용 해시로 한 번만 저장, 여러 사용자가 공유)
+    __tablename__ = "recipe_content"
+
+    content_hash = Column(String(64), primary_key=True)     # 정규화한 JSON 의 sha256
+    recipe = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=False)     # 운영: JSONB, 테스트(sqlite): JSON
+    # 목록 조회용 요약 (저장 시 recipe 에서 추출 -> 목록에서 recipe 전체를 읽지 않음)
+    food_name = Column(Text)
+    ingredient_names = Column(JSON().with_variant(JSONB(), "postgresql"))
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False)
+
 class LikeRecipe(Base):
     __tablename__ = "like_recipe"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    recipe = Column(Text, nullable=False)
+    content_hash = Column(String(64), ForeignKey("recipe_content.content_hash"), nullable=False)
     status = Column(Boolean, nullable=False, server_default=text("TRUE"))
     created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False)
 
     user = relationship("User", back_populates="like_recipe")
-
-class FoodRanking(Base):
+    content = relationship("RecipeContent")
+
+    __table_args__ = (
+        # 같은 레시피를 한 사용자가 여러 번 저장하지 않도록
+        UniqueConstraint("user_id", "content_hash", name="uq_like_recipe_user_content"),
+        # 사용자별 저장 레시피 키셋 페이지네이션 (created_at DESC, id DESC)
+        Index(
+            "ix_like_recipe_active_user_created_at_id", "user_id", "created_at", "id",
+            postgresql_where=text("status"), sqlite_where=text("status")
+        ),
+    )
+
+class FoodRanking(Base):    # 기존 원본 로그 (기동 시 집계 테이블로 압축 후 삭제)
     __tablename__ = "food_ranking"
 
     id = Column(Integer, primary_key=True, index=True)
     food_name = Column(String(40), nullable=False)
-    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False)
\ No newline at end of file
+    created_at = Column(TIMESTAMP(timezone=True), server_default=text("CURRENT_TIMESTAMP"), nullable=False)
+
+class FoodRankingDaily(Base):   # 일자별 음식 랭킹 카운터
+    __tablename__ = "food_ranking_daily"
+
+    day = Column(Date, primary_key=True)
+    food_name = Column(String(40), primary_key=True)
+    count = Column(Integer, nullable=False, server_default=text("0"))
+
+    __table_args__ = (
+        Index("ix_food_ranking_daily_day_count", "day", "count"),
+    )
+
+class FoodRankingTotal(Base):   # 전체 기간 음식 랭킹 카운터
+    __tablename__ = "food_ranking_total"
+
+    food_name = Column(String(40), primary_key=True)
+    count = Column(Integer, nullable=False, server_default=text("0"))
+
+    __table_args__ = (
+        Index("ix_food_ranking_total_count", "count"),
+    )
\ No newline at end of file
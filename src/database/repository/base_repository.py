@@ -1,4 +1,8 @@
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects import postgresql, sqlite
 
 from sqlalchemy.exc import (
     InvalidRequestError,
@@ -10,9 +14,26 @@ from exception.database_exception import TransactionException, DatabaseException
 from exception.base_exception import UnexpectedException
 
 
-async def commit_with_error_handling(session: AsyncSession, context: str = ""):
+def dialect_insert(session: AsyncSession, model):    # ON CONFLICT 를 쓰기 위한 DB별 insert (운영: postgres, 테스트: sqlite)
+    if session.bind.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+async def advisory_xact_lock(session: AsyncSession, key: int):     # 여러 서버가 같은 작업을 동시에 하지 않도록 (트랜잭션 끝에 해제)
+    if session.bind.dialect.name == "postgresql":   # sqlite 는 쓰기가 원래 직렬화됨
+        await session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": key})
+
+
+async def try_advisory_xact_lock(session: AsyncSession, key: int) -> bool:    # 다른 서버가 잡고 있으면 기다리지 않고 False
+    if session.bind.dialect.name != "postgresql":
+        return True
+    return (await session.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": key})).scalar()
+
+
+async def _run_with_error_handling(session: AsyncSession, operation, context: str):
     try:
-        await session.commit()
+        await operation()
     except InvalidRequestError as e:
         await session.rollback()
         raise TransactionException(detail=f"{context}: {str(e)}")
@@ -24,4 +45,24 @@ async def commit_with_error_handling(session: AsyncSession, context: str = ""):
         raise DatabaseException(detail=f"{context}: DB 오류: {str(e)}")
     except Exception as e:
         await session.rollback()
-        raise UnexpectedException(detail=f"{context}: 알 수 없는 에러: {str(e)}")
\ No newline at end of file
+        raise UnexpectedException(detail=f"{context}: 알 수 없는 에러: {str(e)}")
+
+
+async def commit_with_error_handling(session: AsyncSession, context: str = ""):
+    await _run_with_error_handling(session, session.commit, context)
+
+
+async def flush_with_error_handling(session: AsyncSession, context: str = ""):     # 커밋 없이 DB 에 반영 (id 등 발급)
+    await _run_with_error_handling(session, session.flush, context)
+
+
+@asynccontextmanager
+async def unit_of_work(session: AsyncSession):
+    # 요청 단위 트랜잭션: 리포지토리는 flush 만 하고, 요청이 끝날 때 한 번만 커밋 / 예외 시 전체 롤백
+    try:
+        yield session
+    except BaseException:
+        await session.rollback()
+        raise
+    if session.in_transaction():
+        await commit_with_error_handling(session, context="요청 처리")
@@ -1,19 +1,49 @@
+import json
+import random
+from collections import Counter
+from datetime import datetime
+from typing import NamedTuple
+
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import desc, delete
-from sqlalchemy.orm import selectinload
+from sqlalchemy import desc, delete, tuple_, literal, exists, update, func, bindparam, Row
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 
-from database.orm import Board, BoardImage, User, BoardLike, BoardComment
-from database.repository.base_repository import commit_with_error_handling
+from core.config import settings
+from database.orm import Board, BoardImage, User, BoardLike, BoardComment, BoardLikeCounterShard
+from database.repository.base_repository import commit_with_error_handling, flush_with_error_handling, dialect_insert, \
+    try_advisory_xact_lock
+from database.repository.board_search_repository import BoardSearchRepository
 from exception.board_exception import BoardNotFoundException
+from exception.pagination_exception import InvalidCursorException
+from util.cursor import Cursor
+
+LIKE_FOLD_LOCK_KEY = 3101  # 추천 수 샤드 반영용 advisory lock 키
+
+
+class BoardDetail(NamedTuple):
+    id: int
+    user_id: int
+    nickname: str
+    title: str
+    content: str
+    like_count: int
+    created_at: datetime
+    image_urls: list[str]
 
 
 class BoardRepository:
     def __init__(self, session: AsyncSession):
         self.session = session
+        self.search = BoardSearchRepository(session)
+        # 요청 단위 캐시 (리포지토리는 요청마다 생성) -> 같은 게시글을 한 요청에서 두 번 조회하지 않음
+        self._owner_ids: dict[int, int | None] = {}
+        self._details: dict[int, BoardDetail | None] = {}
 
-    async def create_board_with_images(self, user_id: int, title: str, content: str, image_urls: list[str], exist_image: bool) -> Board:
+    async def create_board_with_images(self, user_id: int, nickname: str, title: str, content: str, image_urls: list[str],
+                                       exist_image: bool) -> Board:
         board = Board(user_id=user_id, title=title, content=content, exist_image=exist_image)
+        board.search_tokens = self.search.build_tokens(title, nickname)
         self.session.add(board)
 
         board_images = []
@@ -22,79 +52,271 @@ class BoardRepository:
             board_images.append(board_image)
         self.session.add_all(board_images)
 
-        await commit_with_error_handling(self.session)
-        await self.session.refresh(board)
+        await flush_with_error_handling(self.session)
         return board
 
-    async def get_board(self, board_id: int) -> Board | None:
-        query = (
-            select(Board)
-            .options(
-                selectinload(Board.user),
-                selectinload(Board.images)
+    async def get_board_owner_id(self, board_id: int) -> int | None:    # 게시글 존재/작성자 확인용 (삭제된 글은 None)
+        if board_id not in self._owner_ids:
+            result = await self.session.execute(
+                select(Board.user_id).where(Board.id == board_id, Board.status == True)
             )
+            self._owner_ids[board_id] = result.scalar_one_or_none()
+        return self._owner_ids[board_id]
+
+    def _image_urls(self):    # 게시글 이미지 URL 을 한 컬럼으로 모으는 상관 서브쿼리
+        if self.session.bind.dialect.name == "postgresql":
+            urls = func.array_agg(aggregate_order_by(BoardImage.image_url, BoardImage.id))
+        else:
+            urls = func.json_group_array(BoardImage.image_url)
+        return select(urls).where(BoardImage.board_id == Board.id).scalar_subquery()
+
+    async def get_board(self, board_id: int) -> BoardDetail | None:
+        # 게시글 + 작성자 닉네임 + 이미지 URL 을 한 번에 조회
+        if board_id in self._details:
+            return self._details[board_id]
+
+        stmt = (
+            select(
+                Board.id,
+                Board.user_id,
+                User.nickname,
+                Board.title,
+                Board.content,
+                (Board.like_count + self._pending_like_count()).label("like_count"),
+                Board.created_at,
+                self._image_urls().label("image_urls"),
+            )
+            .join(User, Board.user_id == User.id)
             .where(Board.id == board_id, Board.status == True)
         )
-        result = await self.session.execute(query)
-        return result.scalar_one_or_none()
+        row = (await self.session.execute(stmt)).one_or_none()
 
-    async def get_all_boards(self, skip: int, limit: int, title: str | None = None, nickname: str | None = None) -> \
-    list[Board]:
-        stmt = select(Board).options(selectinload(Board.user))
+        board = None
+        if row is not None:
+            image_urls = row.image_urls
+            if isinstance(image_urls, str):     # sqlite 는 JSON 문자열로 반환
+                image_urls = json.loads(image_urls)
+            board = BoardDetail(**{**row._asdict(), "image_urls": image_urls or []})
+            self._owner_ids[board_id] = board.user_id
 
-        if nickname:
-            stmt = stmt.join(User, Board.user_id == User.id)
+        self._details[board_id] = board
+        return board
 
-        stmt = stmt.where(Board.status == True)
+    def _pending_like_count(self):    # 아직 board.like_count 에 반영되지 않은 샤드 증감 (보통 샤드가 없어 PK 인덱스 조회 한 번)
+        return func.coalesce(
+            select(func.sum(BoardLikeCounterShard.delta))
+            .where(BoardLikeCounterShard.board_id == Board.id)
+            .scalar_subquery(),
+            0
+        )
 
-        if title:
-            stmt = stmt.where(Board.title.like(f"%{title}%"))
-        if nickname:
-            stmt = stmt.where(User.nickname.like(f"%{nickname}%"))
+    async def get_all_boards(self, limit: int, cursor: Cursor | None = None, title: str | None = None,
+                             nickname: str | None = None) -> list[Row]:
+        # 목록에 필요한 컬럼만 조회 (content, ORM 객체 생성 생략)
+        # row: id, title, user_id, nickname, like_count, comment_count, exist_image, created_at, rank
+        columns = (
+            Board.id,
+            Board.title,
+            Board.user_id,
+            User.nickname,
+            (Board.like_count + self._pending_like_count()).label("like_count"),
+            Board.comment_count,
+            Board.exist_image,
+            Board.created_at,
+        )
+
+        # 색인 가능한 검색어는 역색인으로, 1글자 검색어는 LIKE 로 필터링
+        search_title = title if self.search.is_searchable(title) else None
+        search_nickname = nickname if self.search.is_searchable(nickname) else None
+        like_title = title if title and not search_title else None
+        like_nickname = nickname if nickname and not search_nickname else None
 
-        stmt = stmt.order_by(desc(Board.created_at)).offset(skip).limit(limit)
+        if search_title or search_nickname:
+            match = self.search.match_subquery(title=search_title, nickname=search_nickname)
+            rank = match.c.score
+            stmt = select(*columns, rank.label("rank")).join(match, match.c.board_id == Board.id)
+        else:
+            rank = None
+            stmt = select(*columns, literal(None).label("rank"))
+
+        stmt = stmt.join(User, Board.user_id == User.id).where(Board.status == True)
+
+        if like_title:
+            stmt = stmt.where(Board.title.like(f"%{like_title}%"))
+        if like_nickname:
+            stmt = stmt.where(User.nickname.like(f"%{like_nickname}%"))
+
+        if rank is not None:
+            if cursor:
+                if cursor.rank is None:
+                    raise InvalidCursorException()
+                stmt = stmt.where(tuple_(rank, Board.created_at, Board.id) < (cursor.rank, cursor.created_at, cursor.id))
+            stmt = stmt.order_by(desc(rank), desc(Board.created_at), desc(Board.id))
+        else:
+            if cursor:
+                stmt = stmt.where(tuple_(Board.created_at, Board.id) < (cursor.created_at, cursor.id))    # 커서 이후(더 오래된) 게시글만
+            stmt = stmt.order_by(desc(Board.created_at), desc(Board.id))
+
+        stmt = stmt.limit(limit)
 
         result = await self.session.execute(stmt)
 
-        return result.scalars().all()
+        return result.all()
+
+    async def get_liked_board_ids(self, user_id: int, board_ids: list[int]) -> set[int]:    # 한 페이지 게시글 중 사용자가 추천한 게시글
+        if not board_ids:
+            return set()
+        result = await self.session.execute(
+            select(BoardLike.board_id).where(BoardLike.user_id == user_id, BoardLike.board_id.in_(board_ids))
+        )
+        return set(result.scalars().all())
 
     async def soft_delete_board(self, board_id: int):
-        board = await self.get_board(board_id)
-        if board:
-            board.status = False
-            await commit_with_error_handling(self.session)
-
-    async def toggle_like(self, user_id: int, board_id: int):
-        stmt = select(BoardLike).where(
-            BoardLike.user_id == user_id,
-            BoardLike.board_id == board_id
+        await self.session.execute(
+            update(Board).where(Board.id == board_id, Board.status == True).values(status=False)
         )
-        existing_like = await self.session.execute(stmt)
-        existing_like = existing_like.scalar_one_or_none()
+        self._owner_ids.pop(board_id, None)
+        self._details.pop(board_id, None)
 
-        board = await self.get_board(board_id)
-        if not board:
+    def _active_board(self, board_id: int):
+        return exists().where(Board.id == board_id, Board.status == True)
+
+    async def _ensure_board_exists(self, board_id: int):
+        if await self.get_board_owner_id(board_id) is None:
             raise BoardNotFoundException
 
-        if existing_like:
+    async def _change_like_count(self, board_id: int, delta: int):
+        # 평소에는 board.like_count 를 바로 갱신, 다른 트랜잭션이 board 행을 잡고 있을 때(인기글 동시 추천)만 샤드에 기록
+        unlocked = select(Board.id).where(Board.id == board_id).with_for_update(skip_locked=True)    # sqlite 는 FOR UPDATE 없음
+        updated = (await self.session.execute(
+            update(Board).where(Board.id.in_(unlocked)).values(like_count=Board.like_count + delta).returning(Board.id)
+        )).scalar_one_or_none()
+
+        if updated is None:
+            stmt = dialect_insert(self.session, BoardLikeCounterShard).values(
+                board_id=board_id, shard=random.randrange(settings.LIKE_COUNTER_SHARDS), delta=delta
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[BoardLikeCounterShard.board_id, BoardLikeCounterShard.shard],
+                set_={"delta": BoardLikeCounterShard.delta + stmt.excluded.delta}
+            )
+            await self.session.execute(stmt)
+        self._details.pop(board_id, None)
+
+    async def fold_like_counters(self) -> int:    # 샤드 증감을 board.like_count 에 반영
+        # 샤드는 경합이 있을 때만 생기므로 대부분 바로 종료
+        if (await self.session.execute(select(BoardLikeCounterShard.board_id).limit(1))).first() is None:
+            return 0
+
+        # 한 서버만 반영 (다른 서버가 반영 중이면 건너뜀)
+        if not await try_advisory_xact_lock(self.session, LIKE_FOLD_LOCK_KEY):
+            return 0
+
+        # 샤드를 삭제하면서 값을 가져오므로, 그 뒤에 들어온 증감은 새 샤드 행으로 남아 다음 반영 때 처리
+        rows = (await self.session.execute(
+            delete(BoardLikeCounterShard).returning(BoardLikeCounterShard.board_id, BoardLikeCounterShard.delta)
+        )).all()
+
+        pending = Counter()
+        for board_id, delta in rows:
+            pending[board_id] += delta
+
+        board = Board.__table__
+        values = [{"b_id": board_id, "b_delta": delta} for board_id, delta in pending.items() if delta]
+        if values:
             await self.session.execute(
-                delete(BoardLike).where(
-                    BoardLike.user_id == user_id,
-                    BoardLike.board_id == board_id
-                )
+                update(board)
+                .where(board.c.id == bindparam("b_id"))
+                .values(like_count=board.c.like_count + bindparam("b_delta")),
+                values
             )
-            board.like_count -= 1
+        await commit_with_error_handling(self.session, context="게시글 추천 수 반영")
+        return len(values)
 
-            await commit_with_error_handling(self.session)
+    async def _insert_like(self, user_id: int, board_id: int) -> bool:
+        # 게시글이 존재할 때만 추가, 이미 추천했다면 아무것도 하지 않음
+        stmt = (
+            dialect_insert(self.session, BoardLike)
+            .from_select(
+                ["user_id", "board_id"],
+                select(literal(user_id), literal(board_id)).where(self._active_board(board_id))
+            )
+            .on_conflict_do_nothing(index_elements=[BoardLike.user_id, BoardLike.board_id])
+            .returning(BoardLike.board_id)
+        )
+        inserted = (await self.session.execute(stmt)).scalar_one_or_none()
+        if inserted is None:
             return False
 
-        else:
-            new_like = BoardLike(user_id=user_id, board_id=board_id)
-            self.session.add(new_like)
-            board.like_count += 1
+        await self._change_like_count(board_id, 1)
+        return True
+
+    async def _delete_like(self, user_id: int, board_id: int) -> bool:
+        stmt = (
+            delete(BoardLike)
+            .where(
+                BoardLike.user_id == user_id,
+                BoardLike.board_id == board_id,
+                self._active_board(board_id)
+            )
+            .returning(BoardLike.board_id)
+        )
+        deleted = (await self.session.execute(stmt)).scalar_one_or_none()
+        if deleted is None:
+            return False
+
+        await self._change_like_count(board_id, -1)
+        return True
+
+    async def add_like(self, user_id: int, board_id: int) -> bool:    # 추천 (이미 추천했으면 그대로)
+        if not await self._insert_like(user_id, board_id):
+            await self._ensure_board_exists(board_id)
+            return False
+        return True
 
-            await commit_with_error_handling(self.session)
-            return True
+    async def remove_like(self, user_id: int, board_id: int) -> bool:     # 추천 취소 (추천하지 않았으면 그대로)
+        if not await self._delete_like(user_id, board_id):
+            await self._ensure_board_exists(board_id)
+            return False
+        return True
+
+    async def toggle_like(self, user_id: int, board_id: int) -> bool:
+        if await self._delete_like(user_id, board_id):
+            return False
+
+        if not await self._insert_like(user_id, board_id):
+            # 삭제도 추가도 안 됐다면 게시글이 없거나, 동시에 다른 요청이 추천한 경우
+            await self._ensure_board_exists(board_id)
+        return True
+
+    async def _change_comment_count(self, board_id: int, delta: int):
+        stmt = update(Board).where(Board.id == board_id).values(comment_count=Board.comment_count + delta)
+        if delta < 0:
+            stmt = stmt.where(Board.comment_count >= -delta)   # 음수가 되지 않도록
+        await self.session.execute(stmt)
+
+    async def backfill_comment_counts(self, batch_size: int = 1000) -> int:
+        # 실제 댓글 수와 다른 게시글만 다시 계산 (comment_count 추가 이전 게시글 등, database/backfill.py 로 한 번 실행)
+        # 먼저 board 행을 잠근 뒤 새 문장에서 세므로, 그 사이 커밋된 댓글도 포함되고 진행 중인 댓글은 잠금 해제 후 +1
+        actual = (
+            select(func.count())
+            .where(BoardComment.board_id == Board.id, BoardComment.status == True)
+            .scalar_subquery()
+        )
+        fixed, last_id = 0, 0
+        while True:
+            ids = (await self.session.execute(
+                select(Board.id).where(Board.id > last_id).order_by(Board.id).limit(batch_size).with_for_update()
+            )).scalars().all()
+            if not ids:
+                return fixed
+
+            result = await self.session.execute(
+                update(Board).where(Board.id.in_(ids), Board.comment_count != actual).values(comment_count=actual)
+            )
+            await commit_with_error_handling(self.session, context="댓글 수 보정")
+            fixed += result.rowcount
+            last_id = ids[-1]
 
     async def create_comment(self, user_id: int, board_id: int, comment: str):
         new_comment = BoardComment(
@@ -103,17 +325,22 @@ class BoardRepository:
             comment=comment
         )
         self.session.add(new_comment)
-        await commit_with_error_handling(self.session)
-        await self.session.refresh(new_comment)
+        await flush_with_error_handling(self.session)
+        await self._change_comment_count(board_id, 1)     # 댓글과 같은 트랜잭션에서 댓글 수 갱신
         return new_comment
 
-    async def get_comments_by_board_id(self, board_id: int):
+    async def get_comments_by_board_id(self, board_id: int, limit: int, cursor: Cursor | None = None):
         stmt = select(BoardComment, User.nickname).join(
             User, BoardComment.user_id == User.id
         ).where(
             BoardComment.board_id == board_id,
             BoardComment.status == True
-        ).order_by(desc(BoardComment.created_at))
+        )
+
+        if cursor:
+            stmt = stmt.where(tuple_(BoardComment.created_at, BoardComment.id) > (cursor.created_at, cursor.id))    # 커서 이후(더 최근) 댓글만
+
+        stmt = stmt.order_by(BoardComment.created_at, BoardComment.id).limit(limit)
 
         result = await self.session.execute(stmt)
         return result.all()
@@ -125,7 +352,13 @@ class BoardRepository:
         return result.scalar_one_or_none()
 
     async def soft_delete_comment(self, comment_id: int):
-        comment = await self.get_comment_by_id(comment_id)
-        if comment:
-            comment.status = False
-            await commit_with_error_handling(self.session)
\ No newline at end of file
+        # 이미 삭제된 댓글이면 댓글 수를 다시 줄이지 않음
+        result = await self.session.execute(
+            update(BoardComment)
+            .where(BoardComment.id == comment_id, BoardComment.status == True)
+            .values(status=False)
+            .returning(BoardComment.board_id)
+        )
+        board_id = result.scalar_one_or_none()
+        if board_id is not None:
+            await self._change_comment_count(board_id, -1)
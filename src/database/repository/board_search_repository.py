@@ -0,0 +1,83 @@
+import math
+
+from sqlalchemy.ext.asyncio.session import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy import func, exists, insert
+from sqlalchemy.sql import Subquery
+
+from database.orm import Board, BoardSearchToken, User
+from database.repository.base_repository import commit_with_error_handling
+from util.ngram import bigrams
+
+MIN_MATCH_RATIO = 0.5   # 검색어 바이그램 중 최소 일치 비율
+
+
+class BoardSearchRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def build_tokens(title: str, nickname: str) -> list[BoardSearchToken]:
+        tokens = [BoardSearchToken(field="title", token=token) for token in bigrams(title)]
+        tokens += [BoardSearchToken(field="nickname", token=token) for token in bigrams(nickname)]
+        return tokens
+
+    @staticmethod
+    def is_searchable(query: str | None) -> bool:    # 1글자 검색어는 바이그램이 없어서 색인 불가
+        return bool(bigrams(query))
+
+    def _field_match(self, field: str, query: str) -> Subquery:
+        tokens = bigrams(query)
+        min_match = max(1, math.ceil(len(tokens) * MIN_MATCH_RATIO))
+
+        return (
+            select(BoardSearchToken.board_id, func.count().label("score"))
+            .where(BoardSearchToken.field == field, BoardSearchToken.token.in_(tokens))
+            .group_by(BoardSearchToken.board_id)
+            .having(func.count() >= min_match)
+            .subquery()
+        )
+
+    def match_subquery(self, title: str | None = None, nickname: str | None = None) -> Subquery:
+        # (board_id, score) -> 일치한 바이그램 수가 관련도 점수
+        matches = [self._field_match(field, query) for field, query in (("title", title), ("nickname", nickname)) if query]
+
+        first, *rest = matches
+        score = first.c.score
+        for match in rest:
+            score = score + match.c.score
+
+        stmt = select(first.c.board_id, score.label("score"))
+        for match in rest:
+            stmt = stmt.join(match, match.c.board_id == first.c.board_id)
+        return stmt.subquery()
+
+    async def index_missing_boards(self, batch_size: int = 500) -> int:   # 색인되지 않은 기존 게시글 색인
+        indexed = 0
+        last_id = 0
+        while True:
+            stmt = (
+                select(Board.id, Board.title, User.nickname)
+                .join(User, Board.user_id == User.id)
+                .where(
+                    Board.id > last_id,
+                    ~exists().where(BoardSearchToken.board_id == Board.id)
+                )
+                .order_by(Board.id)
+                .limit(batch_size)
+            )
+            rows = (await self.session.execute(stmt)).all()
+            if not rows:
+                return indexed
+
+            values = [
+                {"board_id": row.id, "field": token.field, "token": token.token}
+                for row in rows
+                for token in self.build_tokens(row.title, row.nickname)
+            ]
+            if values:
+                await self.session.execute(insert(BoardSearchToken), values)
+            await commit_with_error_handling(self.session, context="게시글 검색 색인")
+
+            indexed += len(rows)
+            last_id = rows[-1].id
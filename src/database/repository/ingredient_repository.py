@@ -3,7 +3,7 @@ from sqlalchemy.future import select
 from sqlalchemy import delete, and_
 
 from database.orm import Ingredient
-from database.repository.base_repository import commit_with_error_handling
+from database.repository.base_repository import flush_with_error_handling
 
 
 class IngredientRepository:
@@ -12,8 +12,7 @@ class IngredientRepository:
 
     async def create_ingredient(self, ingredient: Ingredient) -> Ingredient:
         self.session.add(ingredient)
-        await commit_with_error_handling(self.session)
-        await self.session.refresh(ingredient)
+        await flush_with_error_handling(self.session)
         return ingredient
 
     async def get_ingredients(self, user_id: int):
@@ -36,5 +35,4 @@ class IngredientRepository:
             and_(Ingredient.user_id == user_id, Ingredient.id == ingredient_id)
         )
         result = await self.session.execute(stmt)
-        await commit_with_error_handling(self.session, context="식재료 삭제")
         return result.rowcount > 0
\ No newline at end of file
@@ -1,13 +1,26 @@
-import json
-from typing import List, Dict, Any
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Any, Literal
 from sqlalchemy.ext.asyncio.session import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import and_, update
+from sqlalchemy import and_, update, delete, cast, Text, tuple_, Row, table, column, Integer, String, JSON, bindparam, \
+    exists
+from sqlalchemy.orm import aliased
 
-from database.orm import LikeRecipe
-from database.repository.base_repository import commit_with_error_handling
+from database.orm import LikeRecipe, RecipeContent
+from database.repository.base_repository import commit_with_error_handling, dialect_insert, advisory_xact_lock
 from sqlalchemy import func
-from database.orm import FoodRanking
+from database.orm import FoodRanking, FoodRankingDaily, FoodRankingTotal
+from util.content_hash import content_hash
+from util.cursor import Cursor
+
+RankingWindow = Literal["daily", "weekly", "all"]
+WEEKLY_DAYS = 7
+DAILY_RETENTION_DAYS = 30   # 주간 집계에 필요한 기간보다 오래된 일자별 카운터는 삭제
+COMPACTION_LOCK_KEY = 2801  # 음식 랭킹 압축용 advisory lock 키
+
+
+def ranking_today() -> date:   # 랭킹 일자는 서버/DB 세션 시간대와 관계없이 UTC 기준 (DB 쪽 집계도 UTC 날짜)
+    return datetime.now(timezone.utc).date()
 
 
 class RecipeRepository:
@@ -16,27 +29,86 @@ class RecipeRepository:
 
     async def save_recipe_data(self, user_id: int, recipe_data: Dict[str, Any]) -> Dict[str, Any]:
         clean_recipe_data = {k: v for k, v in recipe_data.items() if k != "_ai_provider"}   # _ai_provider 값 삭제
+        recipe_hash = content_hash(clean_recipe_data)
 
-        recipe_json = json.dumps(clean_recipe_data, ensure_ascii=False)
+        # 본문은 해시 기준으로 한 번만 저장
+        await self._insert_contents({recipe_hash: clean_recipe_data})
 
-        like_recipe = LikeRecipe(
-            user_id=user_id,
-            recipe=recipe_json,
-            status=True
-        )
-
-        self.session.add(like_recipe)
-        await commit_with_error_handling(self.session, context="레시피 저장")
-        await self.session.refresh(like_recipe)
+        # 이미 저장한 레시피면 새로 만들지 않고 (삭제했던 것이면 되살려서) 맨 위로 올림
+        like = dialect_insert(self.session, LikeRecipe).values(user_id=user_id, content_hash=recipe_hash, status=True)
+        like = like.on_conflict_do_update(
+            index_elements=[LikeRecipe.user_id, LikeRecipe.content_hash],
+            set_={"status": True, "created_at": func.now()}
+        ).returning(LikeRecipe.id)
+        recipe_id = (await self.session.execute(like)).scalar_one()
 
         return {
-            "id": like_recipe.id,
-            "recipe": json.loads(like_recipe.recipe),
-            "status": like_recipe.status,
+            "id": recipe_id,
+            "recipe": clean_recipe_data,    # 저장한 값을 그대로 반환 (DB 에서 다시 읽어 디코딩하지 않음)
+            "status": True,
         }
 
-    async def get_recipes_by_user(self, user_id: int) -> List[Dict[str, Any]]:
-        stmt = select(LikeRecipe).where(
+    async def _insert_contents(self, contents: Dict[str, Dict[str, Any]]):    # content_hash -> recipe
+        content = dialect_insert(self.session, RecipeContent)
+        await self.session.execute(
+            content.on_conflict_do_nothing(index_elements=[RecipeContent.content_hash]),
+            [
+                {
+                    "content_hash": recipe_hash,
+                    "recipe": recipe,
+                    "food_name": recipe.get("food"),
+                    "ingredient_names": [ingredient["name"] for ingredient in recipe.get("use_ingredients") or []],
+                }
+                for recipe_hash, recipe in contents.items()
+            ]
+        )
+
+    async def backfill_recipe_contents(self, batch_size: int = 500) -> int:
+        # recipe_content 도입 이전 like_recipe.recipe 를 본문 테이블로 옮김 (database/backfill.py 로 한 번 실행)
+        # jsonb::text 는 정규화 JSON 과 형식이 달라 해시는 DB 가 아닌 content_hash() 로 계산
+        legacy = table("like_recipe", column("id", Integer), column("recipe", JSON()), column("content_hash", String))
+        moved, last_id = 0, 0
+        while True:
+            rows = (await self.session.execute(
+                select(legacy.c.id, legacy.c.recipe)
+                .where(legacy.c.content_hash.is_(None), legacy.c.id > last_id)
+                .order_by(legacy.c.id)
+                .limit(batch_size)
+            )).all()
+            if not rows:
+                break
+
+            contents, hashes = {}, []
+            for row_id, recipe in rows:
+                recipe = {k: v for k, v in recipe.items() if k != "_ai_provider"}
+                recipe_hash = content_hash(recipe)
+                contents[recipe_hash] = recipe
+                hashes.append({"l_id": row_id, "l_hash": recipe_hash})
+
+            await self._insert_contents(contents)
+            await self.session.execute(
+                update(legacy).where(legacy.c.id == bindparam("l_id")).values(content_hash=bindparam("l_hash")),
+                hashes
+            )
+            await commit_with_error_handling(self.session, context="레시피 본문 이전")
+            moved += len(rows)
+            last_id = rows[-1].id
+
+        # 같은 사용자가 같은 레시피를 여러 번 저장했으면 (활성, 최신) 한 건만 남김 -> 이후 유니크 제약 추가 가능
+        newer = aliased(LikeRecipe)
+        await self.session.execute(delete(LikeRecipe).where(exists().where(
+            newer.user_id == LikeRecipe.user_id,
+            newer.content_hash == LikeRecipe.content_hash,
+            tuple_(newer.status, newer.created_at, newer.id) > tuple_(LikeRecipe.status, LikeRecipe.created_at, LikeRecipe.id),
+        )))
+        await commit_with_error_handling(self.session, context="중복 저장 레시피 정리")
+        return moved
+
+    async def get_recipes_json_by_user(self, user_id: int) -> str:
+        # 저장된 JSON 을 텍스트 그대로 받아 응답 JSON 배열로 이어붙임 (dict 변환/재직렬화 생략)
+        stmt = select(LikeRecipe.id, cast(RecipeContent.recipe, Text)).join(
+            RecipeContent, LikeRecipe.content_hash == RecipeContent.content_hash
+        ).where(
             and_(
                 LikeRecipe.user_id == user_id,
                 LikeRecipe.status == True
@@ -44,15 +116,43 @@ class RecipeRepository:
         ).order_by(LikeRecipe.created_at.desc())
 
         result = await self.session.execute(stmt)
-        recipes = result.scalars().all()
 
-        return [
-            {
-                "id": recipe.id,
-                "recipe": json.loads(recipe.recipe),
-            }
-            for recipe in recipes
-        ]
+        return "[" + ",".join(f'{{"id":{recipe_id},"recipe":{recipe}}}' for recipe_id, recipe in result.all()) + "]"
+
+    async def get_recipe_summaries_by_user(self, user_id: int, limit: int, cursor: Cursor | None = None) -> list[Row]:
+        # row: id, food_name, ingredient_names, created_at (recipe 본문은 조회하지 않음)
+        stmt = select(
+            LikeRecipe.id,
+            RecipeContent.food_name,
+            RecipeContent.ingredient_names,
+            LikeRecipe.created_at
+        ).join(
+            RecipeContent, LikeRecipe.content_hash == RecipeContent.content_hash
+        ).where(
+            LikeRecipe.user_id == user_id,
+            LikeRecipe.status == True
+        )
+
+        if cursor:
+            stmt = stmt.where(tuple_(LikeRecipe.created_at, LikeRecipe.id) < (cursor.created_at, cursor.id))
+
+        stmt = stmt.order_by(LikeRecipe.created_at.desc(), LikeRecipe.id.desc()).limit(limit)
+
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def get_recipe_json(self, user_id: int, recipe_id: int) -> str | None:    # 저장된 레시피 1건 (JSON 문자열 그대로)
+        stmt = select(cast(RecipeContent.recipe, Text)).join(
+            LikeRecipe, LikeRecipe.content_hash == RecipeContent.content_hash
+        ).where(
+            LikeRecipe.id == recipe_id,
+            LikeRecipe.user_id == user_id,
+            LikeRecipe.status == True
+        )
+        recipe = (await self.session.execute(stmt)).scalar_one_or_none()
+        if recipe is None:
+            return None
+        return f'{{"id":{recipe_id},"recipe":{recipe}}}'
 
     async def soft_delete_recipe(self, user_id: int, recipe_id: int) -> bool:
         stmt = update(LikeRecipe).where(
@@ -64,30 +164,99 @@ class RecipeRepository:
         ).values(status=False)
 
         result = await self.session.execute(stmt)
-        await commit_with_error_handling(self.session, context="레시피 삭제")
 
         return result.rowcount > 0
 
-    async def log_food_ranking(self, food_name: str) -> None:   # food_ranking 로그 수집
-        if not food_name:
+    async def increment_food_counts(self, counts: Dict[str, int], day: date | None = None) -> None:
+        # 일자별/전체 카운터를 upsert 로 증가 (count = count + n)
+        if not counts:
             return
-        entry = FoodRanking(food_name=food_name)
-        self.session.add(entry)
-        await commit_with_error_handling(self.session, context="음식 랭킹 기록")
-
-    async def get_food_ranking(self, limit: int = 20) -> List[Dict[str, Any]]:  # ranking 조회
-        stmt = (
-            select(
-                FoodRanking.food_name,
-                func.count(FoodRanking.id).label("count")
-            )
-            .group_by(FoodRanking.food_name)
-            .order_by(func.count(FoodRanking.id).desc(), FoodRanking.food_name.asc())
-            .limit(limit)
+        day = day or ranking_today()
+
+        daily = dialect_insert(self.session, FoodRankingDaily)
+        await self.session.execute(
+            daily.on_conflict_do_update(
+                index_elements=[FoodRankingDaily.day, FoodRankingDaily.food_name],
+                set_={"count": FoodRankingDaily.count + daily.excluded.count},
+            ),
+            [{"day": day, "food_name": name, "count": count} for name, count in counts.items()]
+        )
+
+        total = dialect_insert(self.session, FoodRankingTotal)
+        await self.session.execute(
+            total.on_conflict_do_update(
+                index_elements=[FoodRankingTotal.food_name],
+                set_={"count": FoodRankingTotal.count + total.excluded.count},
+            ),
+            [{"food_name": name, "count": count} for name, count in counts.items()]
         )
+
+    async def get_food_ranking(self, limit: int = 20, window: RankingWindow = "all") -> List[Dict[str, Any]]:  # ranking 조회
+        if window == "all":
+            stmt = (
+                select(FoodRankingTotal.food_name, FoodRankingTotal.count)
+                .order_by(FoodRankingTotal.count.desc(), FoodRankingTotal.food_name.asc())
+                .limit(limit)
+            )
+        else:
+            days = 1 if window == "daily" else WEEKLY_DAYS
+            since = ranking_today() - timedelta(days=days - 1)
+            count = func.sum(FoodRankingDaily.count).label("count")
+            stmt = (
+                select(FoodRankingDaily.food_name, count)
+                .where(FoodRankingDaily.day >= since)
+                .group_by(FoodRankingDaily.food_name)
+                .order_by(count.desc(), FoodRankingDaily.food_name.asc())
+                .limit(limit)
+            )
+
         result = await self.session.execute(stmt)
         rows = result.all()
         return [
             {"food_name": row.food_name, "count": row.count}
             for row in rows
-        ]
\ No newline at end of file
+        ]
+
+    async def delete_expired_daily_counts(self) -> None:
+        expired = ranking_today() - timedelta(days=DAILY_RETENTION_DAYS)
+        await self.session.execute(delete(FoodRankingDaily).where(FoodRankingDaily.day < expired))
+
+    async def compact_food_ranking(self) -> int:
+        # 기존 원본 로그(food_ranking)를 카운터 테이블로 합치고 삭제, 오래된 일자별 카운터 정리
+        # 여러 서버가 동시에 기동해도 원본 로그를 두 번 합치지 않도록 잠금 후 max_id 조회
+        await advisory_xact_lock(self.session, COMPACTION_LOCK_KEY)
+        max_id = (await self.session.execute(select(func.max(FoodRanking.id)))).scalar()
+        compacted = 0
+
+        if max_id is not None:
+            raw = FoodRanking.id <= max_id
+            created_at = FoodRanking.created_at
+            if self.session.bind.dialect.name == "postgresql":     # sqlite 의 CURRENT_TIMESTAMP 는 원래 UTC
+                created_at = func.timezone("UTC", created_at)
+            day = func.date(created_at)
+
+            daily = dialect_insert(self.session, FoodRankingDaily).from_select(
+                ["day", "food_name", "count"],
+                select(day, FoodRanking.food_name, func.count()).where(raw).group_by(day, FoodRanking.food_name)
+            )
+            await self.session.execute(daily.on_conflict_do_update(
+                index_elements=[FoodRankingDaily.day, FoodRankingDaily.food_name],
+                set_={"count": FoodRankingDaily.count + daily.excluded.count},
+            ))
+
+            total = dialect_insert(self.session, FoodRankingTotal).from_select(
+                ["food_name", "count"],
+                select(FoodRanking.food_name, func.count()).where(raw).group_by(FoodRanking.food_name)
+            )
+            await self.session.execute(total.on_conflict_do_update(
+                index_elements=[FoodRankingTotal.food_name],
+                set_={"count": FoodRankingTotal.count + total.excluded.count},
+            ))
+
+            result = await self.session.execute(delete(FoodRanking).where(raw))
+            compacted = result.rowcount
+
+        await self.delete_expired_daily_counts()
+
+        await commit_with_error_handling(self.session, context="음식 랭킹 압축")
+        return compacted
@@ -1,14 +1,14 @@
-from sqlalchemy import select
+from sqlalchemy import select, or_
 from sqlalchemy.sql import Select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio.session import AsyncSession
-from typing import Optional, Any, List
+from typing import Optional, Any
 from datetime import date
 
 from database.orm import User, Ingredient
 from exception.database_exception import DatabaseException
 from exception.base_exception import UnexpectedException
-from database.repository.base_repository import commit_with_error_handling
+from database.repository.base_repository import flush_with_error_handling
 from exception.foodthing_exception import AIServiceException
 
 
@@ -37,6 +37,36 @@ class UserRepository:
     async def get_user_by_phone_num(self, phone_num: str) -> Optional[User]:
         return await self._get_user_by_field("phone_num", phone_num)
 
+    async def find_taken_fields(self, email: str | None = None, nickname: str | None = None,
+                                phone_num: str | None = None) -> set[str]:
+        # 이메일/닉네임/전화번호 중복을 한 번에 조회 (각 컬럼의 unique 인덱스 사용)
+        wanted = {field: value for field, value in (("email", email), ("nickname", nickname), ("phone_num", phone_num)) if value}
+        if not wanted:
+            return set()
+        conditions = [getattr(User, field) == value for field, value in wanted.items()]
+        try:
+            result = await self.session.execute(
+                select(User.email, User.nickname, User.phone_num).where(or_(*conditions))
+            )
+        except SQLAlchemyError as e:
+            raise DatabaseException(detail=f"DB 조회 오류: {str(e)}")
+
+        return {field for row in result.all() for field, value in wanted.items() if getattr(row, field) == value}
+
+    async def iter_user_identities(self, batch_size: int):     # (id, email, nickname) 을 id 순으로 나눠서 조회
+        last_id = 0
+        while True:
+            rows = (await self.session.execute(
+                select(User.id, User.email, User.nickname)
+                .where(User.id > last_id)
+                .order_by(User.id)
+                .limit(batch_size)
+            )).all()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1].id
+
     async def get_user_ingredients(self, user_id: int):
         try:
             ingredients = await self.session.execute(
@@ -46,11 +76,12 @@ class UserRepository:
         except Exception as e:
             raise AIServiceException(detail=f"DB에서 재료 조회 실패: {str(e)}")
 
-    async def find_candidates_for_find_id(self, name: str, birth) -> List[User]:
+    async def find_email_for_find_id(self, name: str, birth: date, phone_num: str) -> Optional[str]:
+        # 전화번호 digest 는 unique 라서 인덱스로 한 행만 조회, 이름/생년월일은 같은 행에서 확인
         try:
-            stmt: Select = select(User).where(User.name == name, User.birth == birth)
+            stmt: Select = select(User.email).where(User.phone_num == phone_num, User.name == name, User.birth == birth)
             result = await self.session.execute(stmt)
-            return list(result.scalars().all())
+            return result.scalar_one_or_none()
         except SQLAlchemyError as e:
             raise DatabaseException(detail=f"DB 조회 오류: {str(e)}")
         except Exception as e:
@@ -58,11 +89,10 @@ class UserRepository:
 
     async def save_user(self, user: User) -> User:
         self.session.add(user)
-        await commit_with_error_handling(self.session)
-        await self.session.refresh(user)
+        await flush_with_error_handling(self.session)
         return user
 
     async def update_password(self, user: User, hashed_password: str) -> None:
         user.password = hashed_password
         self.session.add(user)
-        await commit_with_error_handling(self.session)
\ No newline at end of file
+        await flush_with_error_handling(self.session)
\ No newline at end of file
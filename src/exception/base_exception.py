@@ -1,9 +1,11 @@
 class CustomException(Exception):
 
-    def __init__(self, status_code: int = 400, detail: str = "에러 발생", code: str = "ERROR"):
+    def __init__(self, status_code: int = 400, detail: str = "에러 발생", code: str = "ERROR",
+                 headers: dict[str, str] | None = None):
         self.status_code = status_code
         self.detail = detail
         self.code = code
+        self.headers = headers     # 응답 헤더 (예: Retry-After)
 
 class GlobalException(Exception):
     def __init__(self, status_code: int = 500, detail: str = "에러 발생", code: str = "ERROR"):
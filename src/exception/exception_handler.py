@@ -11,7 +11,8 @@ async def custom_exception_handler(request: Request, exc: CustomException):
         content={
             "code": exc.code,
             "detail": exc.detail
-        }
+        },
+        headers=exc.headers
     )
 
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
@@ -0,0 +1,5 @@
+from exception.base_exception import CustomException
+
+class InvalidCursorException(CustomException):
+    def __init__(self, detail="페이지 커서 값이 유효하지 않습니다"):
+        super().__init__(status_code=400, detail=detail, code="INVALID_CURSOR")
@@ -0,0 +1,10 @@
+import math
+
+from exception.base_exception import CustomException
+
+class TooManyRequestsException(CustomException):
+    def __init__(self, retry_after: float, detail="요청이 너무 많습니다. 잠시 후 다시 시도해주세요."):
+        super().__init__(
+            status_code=429, detail=detail, code="TOO_MANY_REQUESTS",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
@@ -50,4 +50,8 @@ class PasswordLengthException(CustomException):
 
 class HaveNotPermissionException(CustomException):
     def __init__(self, detail: str = "권한이 없습니다."):
-        super().__init__(status_code=404, detail=detail, code="HAVE_NOT_PERMISSION")
\ No newline at end of file
+        super().__init__(status_code=404, detail=detail, code="HAVE_NOT_PERMISSION")
+
+class TokenStoreUnavailableException(CustomException):
+    def __init__(self, detail: str = "인증 서버를 일시적으로 사용할 수 없습니다. 잠시 후 다시 시도해주세요."):
+        super().__init__(status_code=503, detail=detail, code="TOKEN_STORE_UNAVAILABLE")
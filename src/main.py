@@ -1,14 +1,83 @@
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from api import user, social_auth, ingredient, board, recipe
+from core.connection import AsyncSessionLocal, RedisClient
+from core.di import verify_metrics_token
+from database.repository.board_search_repository import BoardSearchRepository
+from database.repository.recipe_repository import RecipeRepository
+from database.repository.user_repository import UserRepository
+from service.food_ranking_buffer import food_ranking_buffer
+from service.like_counter_folder import like_counter_folder
+from service.user_availability import user_availability
+from service.auth.password_hasher import password_hasher
+from service.auth.oauth_http import oauth_http_clients
+from core.metrics import metrics
 from exception.base_exception import CustomException
 from exception.exception_handler import http_exception_handler, custom_exception_handler, validation_exception_handler, \
     global_exception_handler
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if await RedisClient.init_redis():
+        logger.info("[lifespan] Redis 연결 확인")
+
+    # 검색 색인이 없는 기존 게시글 색인 (색인 실패해도 서버는 기동)
+    try:
+        async with AsyncSessionLocal() as session:
+            indexed = await BoardSearchRepository(session).index_missing_boards()
+            logger.info(f"[lifespan] 게시글 검색 색인 {indexed}건 추가")
+    except Exception:
+        logger.exception("[lifespan] 게시글 검색 색인 실패")
+
+    # 음식 랭킹 원본 로그를 카운터 테이블로 압축
+    try:
+        async with AsyncSessionLocal() as session:
+            compacted = await RecipeRepository(session).compact_food_ranking()
+            logger.info(f"[lifespan] 음식 랭킹 로그 {compacted}건 압축")
+    except Exception:
+        logger.exception("[lifespan] 음식 랭킹 압축 실패")
+
+    # 가입 중복 확인 필터 구성 (실패하면 필터 없이 항상 DB 조회)
+    try:
+        async with AsyncSessionLocal() as session:
+            loaded = await user_availability.rebuild(UserRepository(session))
+            if loaded is not None:
+                logger.info(f"[lifespan] 가입 중복 확인 필터 {loaded}명 반영")
+    except Exception:
+        logger.exception("[lifespan] 가입 중복 확인 필터 구성 실패")
+
+    oauth_http_clients.start()
+    food_ranking_buffer.start()
+    like_counter_folder.start()
+
+    yield
+
+    try:
+        await like_counter_folder.stop()
+    except Exception:
+        logger.exception("[lifespan] 추천 수 최종 반영 실패")
+
+    password_hasher.shutdown()
+
+    try:
+        await food_ranking_buffer.stop()
+    except Exception:
+        logger.exception("[lifespan] 음식 랭킹 최종 반영 실패")
+
+    await oauth_http_clients.close()
+    await RedisClient.close_redis()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # 예외 처리 핸들러 설정
 app.add_exception_handler(CustomException, custom_exception_handler)
@@ -40,4 +109,8 @@ app.include_router(recipe.router)
 
 @app.get("/")
 async def root():
-    return {"Hello":"World"}
\ No newline at end of file
+    return {"Hello":"World"}
+
+@app.get("/metrics", dependencies=[Depends(verify_metrics_token)], include_in_schema=False)   # 프로세스 내 지표 (bcrypt 대기 시간 등)
+async def get_metrics():
+    return metrics.snapshot()
\ No newline at end of file
@@ -16,6 +16,10 @@ class JWTResponse(BaseModel):
 class FindIdResponse(BaseModel):
     email: str
 
+class AvailabilityResponse(BaseModel):     # 요청한 항목만 포함 (True 면 사용 가능)
+    email: Optional[bool] = None
+    nickname: Optional[bool] = None
+
 class IngredientSchema(BaseModel):
     id: int
     user_id: int
@@ -53,5 +57,31 @@ class BoardSummaryResponse(BaseModel):
     title: str
     author: BoardAuthor # nickname 대신 BoardAuthor 사용
     like_count: int
+    comment_count: int
+    liked_by_me: bool = False   # 조회한 사용자의 추천 여부
     exist_image: bool
-    created_at: datetime
\ No newline at end of file
+    created_at: datetime
+
+class BoardListResponse(BaseModel):
+    boards: List[BoardSummaryResponse]
+    next_cursor: Optional[str] = None   # 다음 페이지 커서 (마지막 페이지면 None)
+
+class CommentResponse(BaseModel):
+    id: int
+    user_nickname: str
+    comment: str
+    created_at: datetime
+
+class CommentListResponse(BaseModel):
+    comments: List[CommentResponse]
+    next_cursor: Optional[str] = None   # 다음 페이지 커서 (마지막 페이지면 None)
+
+class SavedRecipeSummaryResponse(BaseModel):
+    id: int
+    food_name: Optional[str] = None
+    ingredient_names: List[str] = []
+    created_at: datetime
+
+class SavedRecipeListResponse(BaseModel):
+    recipes: List[SavedRecipeSummaryResponse]
+    next_cursor: Optional[str] = None   # 다음 페이지 커서 (마지막 페이지면 None)
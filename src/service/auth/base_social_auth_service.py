@@ -1,13 +1,15 @@
 from core.connection import RedisClient
+from service.auth.oauth_http import OAuthHttpClients, oauth_http_clients
 from exception.social_auth_exception import (
     InvalidStateException,
 )
 
 class BaseSocialAuthService:
-    def __init__(self, user_service, user_repo, platform: str):
+    def __init__(self, user_service, user_repo, platform: str, http_clients: OAuthHttpClients | None = None):
         self.user_service = user_service
         self.user_repo = user_repo
         self.platform = platform
+        self.http = (http_clients or oauth_http_clients).get(platform)    # 제공자별 공용 클라이언트
 
     async def save_state(self, state: str):
         redis = await RedisClient.get_redis()
@@ -15,7 +17,10 @@ class BaseSocialAuthService:
 
     async def validate_state(self, state: str):
         redis = await RedisClient.get_redis()
-        saved_state = await redis.get(f"{self.platform}_state:{state}")
+        key = f"{self.platform}_state:{state}"
+        async with redis.pipeline(transaction=True) as pipe:    # 조회와 삭제를 한 번에 (같은 state 재사용 방지)
+            pipe.get(key)
+            pipe.delete(key)
+            saved_state, _ = await pipe.execute()
         if not saved_state:
-            raise InvalidStateException()
-        await redis.delete(f"{self.platform}_state:{state}")
\ No newline at end of file
+            raise InvalidStateException()
\ No newline at end of file
@@ -1,18 +1,18 @@
-import httpx
 import secrets
 
 from urllib.parse import urlencode
 from core.config import settings
 from exception.social_auth_exception import SocialTokenException, SocialUserInfoException
 from service.auth.base_social_auth_service import BaseSocialAuthService
+from service.auth.oauth_http import OAuthHttpClients
 
 import logging
 
 logger = logging.getLogger(__name__)
 
 class GoogleAuthService(BaseSocialAuthService):
-    def __init__(self, user_service, user_repo):
-        super().__init__(user_service, user_repo, platform="google")
+    def __init__(self, user_service, user_repo, http_clients: OAuthHttpClients | None = None):
+        super().__init__(user_service, user_repo, platform="google", http_clients=http_clients)
 
     CLIENT_ID = settings.GOOGLE_CLIENT_ID
     CLIENT_SECRET = settings.GOOGLE_CLIENT_SECRET.get_secret_value()
@@ -37,25 +37,23 @@ class GoogleAuthService(BaseSocialAuthService):
         return f"https://accounts.google.com/o/oauth2/v2/auth?{query}"
 
     async def get_token(self, code: str):
-        async with httpx.AsyncClient() as client:
-            response = await client.post("https://oauth2.googleapis.com/token", data={
-                "code": code,
-                "client_id": self.CLIENT_ID,
-                "client_secret": self.CLIENT_SECRET,
-                "redirect_uri": self.REDIRECT_URI,
-                "grant_type": "authorization_code"
-            })
-            if response.status_code != 200:
-                raise SocialTokenException()
-            return response.json()
+        response = await self.http.post("https://oauth2.googleapis.com/token", data={
+            "code": code,
+            "client_id": self.CLIENT_ID,
+            "client_secret": self.CLIENT_SECRET,
+            "redirect_uri": self.REDIRECT_URI,
+            "grant_type": "authorization_code"
+        })
+        if response.status_code != 200:
+            raise SocialTokenException()
+        return response.json()
 
     async def get_user_info(self, access_token: str):
         headers = {"Authorization": f"Bearer {access_token}"}
-        async with httpx.AsyncClient() as client:
-            response = await client.get("https://www.googleapis.com/oauth2/v1/userinfo", headers=headers)
-            if response.status_code != 200:
-                raise SocialUserInfoException()
-            return response.json()
+        response = await self.http.get("https://www.googleapis.com/oauth2/v1/userinfo", headers=headers)
+        if response.status_code != 200:
+            raise SocialUserInfoException()
+        return response.json()
 
     async def handle_callback(self, code: str, state: str):
         logger.info("[GoogleAuthService] Callback 시작")
@@ -1,14 +1,14 @@
 import secrets
-import httpx
 from urllib.parse import urlencode
 from core.config import settings
 from service.auth.base_social_auth_service import BaseSocialAuthService
+from service.auth.oauth_http import OAuthHttpClients
 from exception.social_auth_exception import SocialTokenException, SocialUserInfoException
 
 
 class KakaoAuthService(BaseSocialAuthService):
-    def __init__(self, user_service, user_repo):
-        super().__init__(user_service, user_repo, platform="kakao")
+    def __init__(self, user_service, user_repo, http_clients: OAuthHttpClients | None = None):
+        super().__init__(user_service, user_repo, platform="kakao", http_clients=http_clients)
 
     CLIENT_ID = settings.KAKAO_CLIENT_ID
     CLIENT_SECRET = settings.KAKAO_CLIENT_SECRET.get_secret_value()
@@ -26,25 +26,23 @@ class KakaoAuthService(BaseSocialAuthService):
         return f"https://kauth.kakao.com/oauth/authorize?{query}"
 
     async def get_token(self, code: str):
-        async with httpx.AsyncClient() as client:
-            response = await client.post("https://kauth.kakao.com/oauth/token", data={
-                "grant_type": "authorization_code",
-                "client_id": self.CLIENT_ID,
-                "client_secret": self.CLIENT_SECRET,
-                "redirect_uri": self.REDIRECT_URI,
-                "code": code
-            })
-            if response.status_code != 200:
-                raise SocialTokenException()
-            return response.json()
+        response = await self.http.post("https://kauth.kakao.com/oauth/token", data={
+            "grant_type": "authorization_code",
+            "client_id": self.CLIENT_ID,
+            "client_secret": self.CLIENT_SECRET,
+            "redirect_uri": self.REDIRECT_URI,
+            "code": code
+        })
+        if response.status_code != 200:
+            raise SocialTokenException()
+        return response.json()
 
     async def get_user_info(self, access_token: str):
         headers = {"Authorization": f"Bearer {access_token}"}
-        async with httpx.AsyncClient() as client:
-            response = await client.get("https://kapi.kakao.com/v2/user/me", headers=headers)
-            if response.status_code != 200:
-                raise SocialUserInfoException()
-            return response.json()
+        response = await self.http.get("https://kapi.kakao.com/v2/user/me", headers=headers)
+        if response.status_code != 200:
+            raise SocialUserInfoException()
+        return response.json()
 
     async def handle_kakao_callback(self, code: str, state: str):
         await self.validate_state(state)
@@ -1,16 +1,17 @@
 import secrets
-import httpx
 from urllib.parse import urlencode
 from datetime import datetime, date
 
 from core.config import settings
 from service.auth.base_social_auth_service import BaseSocialAuthService
+from service.auth.oauth_http import OAuthHttpClients
 from exception.social_auth_exception import SocialTokenException, SocialUserInfoException, SocialSignupException
 from database.orm import User
+from exception.user_exception import TokenStoreUnavailableException
 
 class NaverAuthService(BaseSocialAuthService):
-    def __init__(self, user_service, user_repo):
-        super().__init__(user_service, user_repo, platform="naver")
+    def __init__(self, user_service, user_repo, http_clients: OAuthHttpClients | None = None):
+        super().__init__(user_service, user_repo, platform="naver", http_clients=http_clients)
 
     CLIENT_ID = settings.NAVER_CLIENT_ID
     CLIENT_SECRET = settings.NAVER_CLIENT_SECRET.get_secret_value()
@@ -28,25 +29,23 @@ class NaverAuthService(BaseSocialAuthService):
         return f"https://nid.naver.com/oauth2.0/authorize?{query}"
 
     async def get_token(self, code: str, state: str):
-        async with httpx.AsyncClient() as client:
-            response = await client.post("https://nid.naver.com/oauth2.0/token", data={
-                "grant_type": "authorization_code",
-                "client_id": self.CLIENT_ID,
-                "client_secret": self.CLIENT_SECRET,
-                "code": code,
-                "state": state
-            })
-            if response.status_code != 200:
-                raise SocialTokenException()
-            return response.json()
+        response = await self.http.post("https://nid.naver.com/oauth2.0/token", data={
+            "grant_type": "authorization_code",
+            "client_id": self.CLIENT_ID,
+            "client_secret": self.CLIENT_SECRET,
+            "code": code,
+            "state": state
+        })
+        if response.status_code != 200:
+            raise SocialTokenException()
+        return response.json()
 
     async def get_user_info(self, access_token: str):
         headers = {"Authorization": f"Bearer {access_token}"}
-        async with httpx.AsyncClient() as client:
-            response = await client.get("https://openapi.naver.com/v1/nid/me", headers=headers)
-            if response.status_code != 200:
-                raise SocialUserInfoException()
-            return response.json()
+        response = await self.http.get("https://openapi.naver.com/v1/nid/me", headers=headers)
+        if response.status_code != 200:
+            raise SocialUserInfoException()
+        return response.json()
 
     async def handle_callback(self, code: str, state: str):
         await self.validate_state(state)
@@ -83,13 +82,13 @@ class NaverAuthService(BaseSocialAuthService):
 
         # 로그인 -> 정보 없다면 신규 가입
         if user:
-            token = self.user_service.create_jwt(user.email)
+            token = await self.user_service.issue_jwt(user)
             return f"http://프론트엔드서버/auth/success?token={token}"
 
         # 신규 가입
         try:
             random_password = secrets.token_urlsafe(12)
-            hashed_password = self.user_service.hash_password(random_password)
+            hashed_password = await self.user_service.hash_password(random_password)
 
             new_user = User(
                 email=email_for_db,
@@ -103,9 +102,12 @@ class NaverAuthService(BaseSocialAuthService):
             )
 
             saved = await self.user_repo.save_user(new_user)
-            token = self.user_service.create_jwt(saved.id)
+            await self.user_service.remember_user(saved)
+            token = await self.user_service.issue_jwt(saved)
             return f"http://프론트엔드서버/auth/success?token={token}"
 
+        except TokenStoreUnavailableException:
+            raise
         except Exception as e:
             import traceback
             raise SocialSignupException(detail=f"네이버 회원가입 오류: {e}\n{traceback.format_exc()}")
@@ -0,0 +1,46 @@
+import importlib.util
+
+import httpx
+
+from core.config import settings
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None    # httpx[http2] 가 설치된 경우에만 HTTP/2
+
+PROVIDERS = ("google", "kakao", "naver")
+
+
+class OAuthHttpClients:     # 소셜 로그인 제공자별 공용 httpx 클라이언트 (keep-alive 로 TLS 핸드셰이크 재사용)
+
+    def __init__(self, transport: httpx.AsyncBaseTransport | None = None):
+        self.transport = transport
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _create(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE and self.transport is None,
+            transport=self.transport,
+            timeout=httpx.Timeout(settings.SOCIAL_HTTP_TIMEOUT_SECONDS, connect=settings.SOCIAL_HTTP_CONNECT_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=settings.SOCIAL_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.SOCIAL_HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=settings.SOCIAL_HTTP_KEEPALIVE_SECONDS,
+            ),
+        )
+
+    def get(self, provider: str) -> httpx.AsyncClient:     # lifespan 밖(테스트 등)에서는 처음 사용할 때 생성
+        client = self._clients.get(provider)
+        if client is None or client.is_closed:
+            client = self._clients[provider] = self._create()
+        return client
+
+    def start(self):
+        for provider in PROVIDERS:
+            self.get(provider)
+
+    async def close(self):
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+oauth_http_clients = OAuthHttpClients()
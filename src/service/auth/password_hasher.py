@@ -0,0 +1,44 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from core.config import settings
+from core.metrics import metrics
+
+ENCODING = "UTF-8"
+
+
+class PasswordHasher:   # bcrypt 를 이벤트 루프 밖의 전용 스레드 풀에서 실행 (bcrypt 는 해싱 중 GIL 을 놓음)
+
+    def __init__(self, max_workers: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+
+    async def _run(self, name: str, fn, *args):
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            metrics.observe("bcrypt_queue_wait_seconds", started - submitted)    # 워커가 비기를 기다린 시간
+            try:
+                return fn(*args)
+            finally:
+                metrics.observe(f"bcrypt_{name}_seconds", time.perf_counter() - started)
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+
+    async def hash(self, plain_password: str) -> str:
+        hashed: bytes = await self._run("hash", bcrypt.hashpw, plain_password.encode(ENCODING), bcrypt.gensalt())
+        return hashed.decode(ENCODING)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            "verify", bcrypt.checkpw, plain_password.encode(ENCODING), hashed_password.encode(ENCODING)
+        )
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+password_hasher = PasswordHasher(max_workers=settings.BCRYPT_MAX_WORKERS)
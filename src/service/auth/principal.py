@@ -0,0 +1,138 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+
+from core.config import settings
+from core.connection import RedisClient, RedisBacked
+from database.orm import User
+from exception.user_exception import TokenStoreUnavailableException
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Principal:    # 인증된 사용자 (세션과 무관한 불변 객체)
+    id: int
+    email: str
+    nickname: str
+    status: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, nickname=user.nickname, status=user.status)
+
+
+class PrincipalCache(RedisBacked):   # 프로세스 내 LRU -> Redis -> (없으면 호출한 쪽에서 DB 조회)
+
+    def __init__(self, ttl_seconds: int, max_size: int, redis_getter=RedisClient.get_redis):
+        super().__init__(redis_getter)
+        self.ttl = ttl_seconds
+        self.max_size = max_size
+
+        self._local: OrderedDict[str, tuple[float, Principal]] = OrderedDict()    # email -> (만료 시각, principal)
+
+    def _key(self, email: str) -> str:
+        return f"principal:{email}"
+
+    def _set_local(self, principal: Principal):
+        self._local[principal.email] = (time.monotonic() + self.ttl, principal)
+        self._local.move_to_end(principal.email)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    async def get(self, email: str) -> Principal | None:
+        entry = self._local.get(email)
+        if entry is not None:
+            expires_at, principal = entry
+            if expires_at > time.monotonic():
+                self._local.move_to_end(email)
+                return principal
+            del self._local[email]
+
+        redis = await self._redis()
+        if redis is None:
+            return None
+        try:
+            cached = await redis.get(self._key(email))
+        except Exception:
+            self._redis_unavailable()
+            return None
+        if cached is None:
+            return None
+
+        principal = Principal(**json.loads(cached))
+        self._set_local(principal)
+        return principal
+
+    async def set(self, principal: Principal):
+        self._set_local(principal)
+
+        redis = await self._redis()
+        if redis is None:
+            return
+        try:
+            await redis.setex(self._key(principal.email), self.ttl, json.dumps(asdict(principal)))
+        except Exception:
+            self._redis_unavailable()
+
+    async def invalidate(self, email: str):    # 비밀번호/상태/프로필 변경 시 호출
+        self._local.pop(email, None)
+
+        redis = await self._redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(self._key(email))
+        except Exception:
+            self._redis_unavailable()
+
+
+class TokenVersionStore(RedisBacked):     # 사용자별 토큰 버전 (올리면 이전에 발급한 토큰이 모두 무효)
+    # Redis 장애 시 버전을 알 수 없으므로 0 으로 대신하지 않고 TokenStoreUnavailableException
+
+    def _key(self, user_id: int) -> str:
+        return f"token_ver:{user_id}"
+
+    async def get(self, user_id: int) -> int:
+        redis = await self._redis()
+        if redis is None:
+            raise TokenStoreUnavailableException()
+        try:
+            version = await redis.get(self._key(user_id))
+        except Exception:
+            self._redis_unavailable()
+            raise TokenStoreUnavailableException()
+        return int(version or 0)
+
+    async def bump(self, user_id: int) -> int:
+        redis = await self._redis()
+        if redis is None:
+            raise TokenStoreUnavailableException()
+        try:
+            return int(await redis.incr(self._key(user_id)))
+        except Exception:
+            self._redis_unavailable()
+            raise TokenStoreUnavailableException()
+
+
+class InMemoryTokenVersionStore:    # 프로세스 내 토큰 버전 (테스트용)
+
+    def __init__(self):
+        self._versions: dict[int, int] = {}
+
+    async def get(self, user_id: int) -> int:
+        return self._versions.get(user_id, 0)
+
+    async def bump(self, user_id: int) -> int:
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        return self._versions[user_id]
+
+
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+)
+
+token_version_store = TokenVersionStore()
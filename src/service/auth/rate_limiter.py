@@ -0,0 +1,93 @@
+import hashlib
+import logging
+import time
+import uuid
+from collections import deque
+
+from core.config import settings
+from core.connection import RedisClient, RedisBacked
+from exception.rate_limit_exception import TooManyRequestsException
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryRateLimiter:     # 프로세스 내 슬라이딩 윈도우 (테스트 / Redis 장애 시 사용)
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._hits: dict[str, deque[float]] = {}    # key -> 윈도우 안의 요청 시각들
+
+    def _sweep(self, now: float, window: int):     # 키가 너무 많아지면 윈도우가 지난 키 정리
+        for key in [key for key, hits in self._hits.items() if not hits or hits[-1] <= now - window]:
+            del self._hits[key]
+
+    async def hit(self, key: str, limit: int, window: int) -> float | None:    # 제한에 걸리면 재시도까지 남은 초
+        now = time.monotonic()
+        hits = self._hits.get(key)
+        if hits is None:
+            if len(self._hits) >= self.max_keys:
+                self._sweep(now, window)
+            hits = self._hits[key] = deque()
+
+        while hits and hits[0] <= now - window:
+            hits.popleft()
+        if len(hits) >= limit:
+            return hits[0] + window - now
+        hits.append(now)
+        return None
+
+
+class RedisRateLimiter(RedisBacked):   # Redis ZSET 슬라이딩 윈도우 (여러 서버가 같은 카운트를 공유)
+
+    def __init__(self, redis_getter=RedisClient.get_redis, fallback: InMemoryRateLimiter | None = None):
+        super().__init__(redis_getter)
+        self.fallback = fallback or InMemoryRateLimiter()
+
+    async def hit(self, key: str, limit: int, window: int) -> float | None:
+        redis = await self._redis()
+        if redis is None:
+            return await self.fallback.hit(key, limit, window)
+
+        now = time.time()
+        member = f"{now}:{uuid.uuid4().hex[:8]}"
+        try:
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.zremrangebyscore(key, 0, now - window)
+                pipe.zadd(key, {member: now})
+                pipe.zcard(key)
+                pipe.zrange(key, 0, 0, withscores=True)
+                pipe.expire(key, window)
+                _, _, count, oldest, _ = await pipe.execute()
+
+            if count <= limit:
+                return None
+            await redis.zrem(key, member)   # 거절된 요청은 윈도우에 남기지 않음
+        except Exception:
+            self._redis_unavailable()
+            return await self.fallback.hit(key, limit, window)
+
+        oldest_at = oldest[0][1] if oldest else now
+        return max(oldest_at + window - now, 0)
+
+
+class AuthThrottle:     # 인증 엔드포인트별 IP / 계정 단위 요청 제한 (bcrypt 전에 검사)
+
+    def __init__(self, limiter, action: str):
+        self.limiter = limiter
+        self.action = action
+
+    async def _check(self, key: str, limit: int):
+        retry_after = await self.limiter.hit(key, limit, settings.AUTH_RATE_LIMIT_WINDOW_SECONDS)
+        if retry_after is not None:
+            logger.warning(f"[AuthThrottle] 요청 제한: {key}")
+            raise TooManyRequestsException(retry_after)
+
+    async def check_ip(self, ip: str | None):
+        await self._check(f"rl:{self.action}:ip:{ip or 'unknown'}", settings.AUTH_RATE_LIMIT_PER_IP)
+
+    async def check_account(self, identifier: str):    # 이메일/전화번호 등은 해시해서 키로 사용
+        digest = hashlib.sha256(identifier.lower().encode()).hexdigest()[:32]
+        await self._check(f"rl:{self.action}:acct:{digest}", settings.AUTH_RATE_LIMIT_PER_ACCOUNT)
+
+
+rate_limiter = RedisRateLimiter()
@@ -0,0 +1,42 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from core.config import settings
+from core.metrics import metrics
+
+
+class VerifiedTokenCache:   # 서명 검증이 끝난 토큰의 클레임을 exp 까지 보관 (프로세스 내 LRU)
+    # 폐기 여부(토큰 버전)는 캐시와 별개로 매 요청 확인하므로, 여기에는 서명/만료 결과만 저장
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._claims: OrderedDict[bytes, dict] = OrderedDict()    # sha256(token) -> claims
+
+    def _key(self, token: str) -> bytes:     # 토큰 원문은 메모리에 두지 않음
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> dict | None:
+        key = self._key(token)
+        claims = self._claims.get(key)
+        if claims is not None and claims["exp"] > time.time():
+            self._claims.move_to_end(key)
+            metrics.inc("jwt_cache_hit")
+            return claims
+
+        if claims is not None:
+            del self._claims[key]
+        metrics.inc("jwt_cache_miss")
+        return None
+
+    def set(self, token: str, claims: dict):
+        if not isinstance(claims.get("exp"), (int, float)):
+            return
+        key = self._key(token)
+        self._claims[key] = claims
+        self._claims.move_to_end(key)
+        while len(self._claims) > self.max_size:
+            self._claims.popitem(last=False)
+
+
+verified_token_cache = VerifiedTokenCache(max_size=settings.JWT_CACHE_MAX_SIZE)
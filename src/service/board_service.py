@@ -6,7 +6,9 @@ from botocore.exceptions import BotoCoreError, NoCredentialsError
 from core.config import settings
 from exception.board_exception import BoardNotFoundException, AwsError, CommentNotFoundException
 from exception.user_exception import HaveNotPermissionException
-from schema.response import BoardDetailResponse, BoardAuthor, BoardSummaryResponse
+from schema.response import BoardDetailResponse, BoardAuthor, BoardSummaryResponse, BoardListResponse, \
+    CommentResponse, CommentListResponse
+from util.cursor import encode_cursor, decode_cursor
 
 
 class BoardService:
@@ -51,6 +53,7 @@ class BoardService:
 
         board = await self.board_repo.create_board_with_images(
             user_id=current_user.id,
+            nickname=current_user.nickname,
             title=title,
             content=content,
             image_urls=image_urls,
@@ -66,47 +69,67 @@ class BoardService:
         if not board:
             raise BoardNotFoundException
 
-        image_urls = [image.image_url for image in board.images]
-
         return BoardDetailResponse(
             id=board.id,
             author=BoardAuthor(
                 user_id=board.user_id,
-                nickname=board.user.nickname
+                nickname=board.nickname
             ),
             title=board.title,
             content=board.content,
             like_count=board.like_count,
             created_at=board.created_at,
-            image_urls=image_urls
+            image_urls=board.image_urls
+        )
+
+    async def get_all_boards(self, limit: int, cursor: str | None = None, title: str | None = None,
+                             nickname: str | None = None) -> BoardListResponse:
+        decoded_cursor = decode_cursor(cursor) if cursor else None
+
+        # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+        board_list = await self.board_repo.get_all_boards(
+            limit=limit + 1, cursor=decoded_cursor, title=title, nickname=nickname
         )
 
-    async def get_all_boards(self, skip: int, limit: int, title: str | None = None, nickname: str | None = None):
-        board_list = await self.board_repo.get_all_boards(skip=skip, limit=limit, title=title, nickname=nickname)
+        has_next = len(board_list) > limit
+        board_list = board_list[:limit]
+
+        next_cursor = None
+        if has_next:
+            last = board_list[-1]
+            next_cursor = encode_cursor(last.created_at, last.id, last.rank)
+
+        # 현재 사용자의 추천 여부를 페이지 단위로 한 번에 조회
+        current_user = await self.get_current_user()
+        liked_ids = await self.board_repo.get_liked_board_ids(current_user.id, [row.id for row in board_list])
 
-        return [
+        boards = [
             BoardSummaryResponse(
-                id=board.id,
-                title=board.title,
+                id=row.id,
+                title=row.title,
                 author=BoardAuthor(
-                    user_id=board.user_id,
-                    nickname=board.user.nickname
+                    user_id=row.user_id,
+                    nickname=row.nickname
                 ),
-                like_count=board.like_count,
-                exist_image=board.exist_image,
-                created_at=board.created_at
+                like_count=row.like_count,
+                comment_count=row.comment_count,
+                liked_by_me=row.id in liked_ids,
+                exist_image=row.exist_image,
+                created_at=row.created_at
             )
-            for board in board_list
+            for row in board_list
         ]
 
+        return BoardListResponse(boards=boards, next_cursor=next_cursor)
+
     async def soft_delete_board(self, board_id: int):
         current_user = await self.get_current_user()
 
-        board = await self.board_repo.get_board(board_id)
-        if not board:
+        owner_id = await self.board_repo.get_board_owner_id(board_id)
+        if owner_id is None:
             raise BoardNotFoundException
 
-        if board.user_id != current_user.id:
+        if owner_id != current_user.id:
             raise HaveNotPermissionException(detail="삭제권한이 없습니다.")
 
         await self.board_repo.soft_delete_board(board_id)
@@ -122,11 +145,18 @@ class BoardService:
         else:
             return {"message": "게시글 추천을 취소했습니다."}
 
+    async def add_like(self, board_id: int):
+        current_user = await self.get_current_user()
+        await self.board_repo.add_like(current_user.id, board_id)
+
+    async def remove_like(self, board_id: int):
+        current_user = await self.get_current_user()
+        await self.board_repo.remove_like(current_user.id, board_id)
+
     async def create_comment(self, board_id: int, comment: str):
         current_user = await self.get_current_user()
 
-        board = await self.board_repo.get_board(board_id)
-        if not board:
+        if await self.board_repo.get_board_owner_id(board_id) is None:
             raise BoardNotFoundException
 
         return await self.board_repo.create_comment(
@@ -135,23 +165,34 @@ class BoardService:
             comment=comment
         )
 
-    async def get_comments(self, board_id: int):
-        board = await self.board_repo.get_board(board_id)
-        if not board:
+    async def get_comments(self, board_id: int, limit: int, cursor: str | None = None) -> CommentListResponse:
+        if await self.board_repo.get_board_owner_id(board_id) is None:
             raise BoardNotFoundException
 
-        comments = await self.board_repo.get_comments_by_board_id(board_id)
+        decoded_cursor = decode_cursor(cursor) if cursor else None
 
-        result_comments = []
-        for comment, nickname in comments:
-            result_comments.append({
-                "id": comment.id,
-                "user_nickname": nickname,
-                "comment": comment.comment,
-                "created_at": comment.created_at
-            })
+        # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+        comments = await self.board_repo.get_comments_by_board_id(board_id, limit=limit + 1, cursor=decoded_cursor)
+
+        has_next = len(comments) > limit
+        comments = comments[:limit]
+
+        next_cursor = None
+        if has_next:
+            last, _ = comments[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+
+        result_comments = [
+            CommentResponse(
+                id=comment.id,
+                user_nickname=nickname,
+                comment=comment.comment,
+                created_at=comment.created_at
+            )
+            for comment, nickname in comments
+        ]
 
-        return result_comments
+        return CommentListResponse(comments=result_comments, next_cursor=next_cursor)
 
     async def delete_comment(self, comment_id: int):
         current_user = await self.get_current_user()
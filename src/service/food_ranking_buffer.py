@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from collections import Counter
+from datetime import date
+
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from core.config import settings
+from core.connection import AsyncSessionLocal
+from database.orm import FoodRankingTotal
+from database.repository.base_repository import commit_with_error_handling
+from database.repository.recipe_repository import RecipeRepository, ranking_today
+
+logger = logging.getLogger(__name__)
+
+MAX_FOOD_NAME_LENGTH = FoodRankingTotal.__table__.c.food_name.type.length     # 랭킹 테이블 컬럼 길이 (String(40))
+
+
+def _is_transient(exc: BaseException) -> bool:     # 연결 오류만 다시 시도 (데이터 오류는 다시 해도 계속 실패)
+    while exc is not None:
+        if isinstance(exc, (OperationalError, InterfaceError, OSError, asyncio.TimeoutError)):
+            return True
+        if isinstance(exc, DBAPIError) and exc.connection_invalidated:
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class FoodRankingBuffer:    # 음식 랭킹 이벤트를 메모리에 모았다가 주기적으로 한 번에 반영 (write-behind)
+
+    def __init__(self, session_factory, flush_interval_ms: int, max_events: int):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_events = max_events
+
+        self._counts: Counter = Counter()   # (day, food_name) -> count
+        self._pending = 0
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self._pruned_on = ranking_today()    # 기동 시 압축에서 이미 정리하므로, 날짜가 바뀌면 flush 때 오래된 일자별 카운터 정리
+
+    def add(self, food_name: str | None) -> None:     # 요청 경로에서는 메모리 append 만
+        food_name = " ".join((food_name or "").split())     # 앞뒤/연속 공백 정리
+        if not food_name or len(food_name) > MAX_FOOD_NAME_LENGTH:     # 음식 이름이 아닌 긴 채팅 문장은 랭킹에서 제외
+            return
+        self._counts[(ranking_today(), food_name)] += 1
+        self._pending += 1
+        if self._pending >= self.max_events:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        async with self._lock:
+            today = ranking_today()
+            prune = self._pruned_on != today
+            if not self._counts and not prune:
+                return 0
+            counts, self._counts, self._pending = self._counts, Counter(), 0
+
+            by_day: dict[date, dict[str, int]] = {}
+            for (day, food_name), count in counts.items():
+                by_day.setdefault(day, {})[food_name] = count
+
+            try:
+                async with self.session_factory() as session:
+                    repo = RecipeRepository(session)
+                    for day, day_counts in by_day.items():
+                        await repo.increment_food_counts(day_counts, day=day)
+                    if prune:
+                        await repo.delete_expired_daily_counts()
+                    await commit_with_error_handling(session, context="음식 랭킹 기록")
+            except Exception as e:
+                if not _is_transient(e):
+                    logger.error(f"[FoodRankingBuffer] 반영할 수 없는 이벤트 {sum(counts.values())}건 버림")
+                    raise
+                # 연결 오류로 실패한 이벤트는 버리지 않고 다음 flush 때 다시 반영
+                self._counts.update(counts)
+                self._pending += sum(counts.values())
+                raise
+
+            self._pruned_on = today
+            return sum(counts.values())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("[FoodRankingBuffer] 음식 랭킹 반영 실패")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):   # 종료 시 남은 이벤트까지 반영
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+food_ranking_buffer = FoodRankingBuffer(
+    AsyncSessionLocal,
+    flush_interval_ms=settings.FOOD_RANKING_FLUSH_INTERVAL_MS,
+    max_events=settings.FOOD_RANKING_FLUSH_MAX_EVENTS,
+)
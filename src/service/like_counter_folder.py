@@ -0,0 +1,48 @@
+import asyncio
+import logging
+
+from core.config import settings
+from core.connection import AsyncSessionLocal
+from database.repository.board_repository import BoardRepository
+
+logger = logging.getLogger(__name__)
+
+
+class LikeCounterFolder:    # 추천 수 샤드를 주기적으로 board.like_count 에 합산
+
+    def __init__(self, session_factory, fold_interval_ms: int):
+        self.session_factory = session_factory
+        self.fold_interval = fold_interval_ms / 1000
+        self._task: asyncio.Task | None = None
+
+    async def fold(self) -> int:
+        async with self.session_factory() as session:
+            return await BoardRepository(session).fold_like_counters()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.fold_interval)
+            try:
+                await self.fold()
+            except Exception:
+                logger.exception("[LikeCounterFolder] 추천 수 반영 실패")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):   # 종료 시 남은 증감까지 반영
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.fold()
+
+
+like_counter_folder = LikeCounterFolder(
+    AsyncSessionLocal,
+    fold_interval_ms=settings.LIKE_COUNTER_FOLD_INTERVAL_MS,
+)
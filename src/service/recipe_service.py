@@ -8,11 +8,15 @@ from core.config import settings
 from util.prompt_builder import PromptBuilder
 from exception.foodthing_exception import AIServiceException, AINullResponseException, AIJsonDecodeException, \
     InvalidAIRequestException
-from exception.user_exception import TokenExpiredException, UserNotFoundException
+from exception.recipe_exception import RecipeNotFoundException
+from exception.user_exception import TokenExpiredException, UserNotFoundException, TokenStoreUnavailableException, \
+    UnauthorizedException
+from schema.response import SavedRecipeSummaryResponse, SavedRecipeListResponse
+from util.cursor import encode_cursor, decode_cursor
 
 
 class FoodThingAIService:   # 레시피 추출 관련 서비스
-    def __init__(self, user_service, user_repo, access_token: str, req: Request, recipe_repo=None):
+    def __init__(self, user_service, user_repo, access_token: str, req: Request, ranking_buffer=None):
         self.ollama_base_url = settings.OLLAMA_URL
         self.model_name = settings.OLLAMA_MODEL_NAME
         self.num_predict = 1000
@@ -20,7 +24,7 @@ class FoodThingAIService:   # 레시피 추출 관련 서비스
         self.user_repo = user_repo
         self.access_token = access_token
         self.req = req
-        self.recipe_repo = recipe_repo
+        self.ranking_buffer = ranking_buffer
 
         self.openai_api_key = settings.OPENAI_API_KEY.get_secret_value()
         self.openai_model_name = "gpt-4o-mini"
@@ -29,7 +33,7 @@ class FoodThingAIService:   # 레시피 추출 관련 서비스
     async def get_current_user(self):
         try:
             user = await self.user_service.get_user_by_token(self.access_token, self.req)
-        except TokenExpiredException:
+        except (TokenExpiredException, TokenStoreUnavailableException, UnauthorizedException):
             raise
         except Exception as e:
             raise TokenExpiredException(detail=f"토큰 처리 중 오류: {str(e)}")
@@ -190,29 +194,26 @@ class FoodThingAIService:   # 레시피 추출 관련 서비스
     async def get_search_recipe(self, chat: str) -> Dict[str, Any]:
         prompt = PromptBuilder.build_search_prompt(chat)
         result = await self._call_ollama(prompt)
-        try:
-            if self.recipe_repo is not None:
-                food_name = (result.get("food") or "").strip() if isinstance(result, dict) else ""
-                if not food_name:
-                    food_name = chat.strip()
-                if food_name:
-                    await self.recipe_repo.log_food_ranking(food_name)
-        except Exception:
-            pass
+        if self.ranking_buffer is not None:
+            food_name = (result.get("food") or "").strip() if isinstance(result, dict) else ""
+            if not food_name:
+                food_name = chat.strip()
+            self.ranking_buffer.add(food_name)
         return result
 
 class RecipeManagementService:  # 레시피 CRUD 서비스
 
-    def __init__(self, recipe_repo, user_service, access_token: str, req: Request):
+    def __init__(self, recipe_repo, user_service, access_token: str, req: Request, ranking_buffer=None):
         self.recipe_repo = recipe_repo
         self.user_service = user_service
         self.access_token = access_token
         self.req = req
+        self.ranking_buffer = ranking_buffer
 
     async def get_current_user(self):
         try:
             user = await self.user_service.get_user_by_token(self.access_token, self.req)
-        except TokenExpiredException:
+        except (TokenExpiredException, TokenStoreUnavailableException, UnauthorizedException):
             raise
         except Exception as e:
             raise TokenExpiredException(detail=f"토큰 처리 중 오류: {str(e)}")
@@ -225,21 +226,53 @@ class RecipeManagementService:  # 레시피 CRUD 서비스
     async def save_recipe(self, recipe_data: dict):
         user = await self.get_current_user()
         saved = await self.recipe_repo.save_recipe_data(user.id, recipe_data)
-        food_name = recipe_data.get("food")
-        await self.recipe_repo.log_food_ranking(food_name)
+        if self.ranking_buffer is not None:
+            self.ranking_buffer.add(recipe_data.get("food"))
         return saved
 
-    async def get_saved_recipes(self):
+    async def get_saved_recipes(self) -> str:   # JSON 배열 문자열
+        user = await self.get_current_user()
+        return await self.recipe_repo.get_recipes_json_by_user(user.id)
+
+    async def get_saved_recipe_summaries(self, limit: int, cursor: str | None = None) -> SavedRecipeListResponse:
+        user = await self.get_current_user()
+        decoded_cursor = decode_cursor(cursor) if cursor else None
+
+        # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+        rows = await self.recipe_repo.get_recipe_summaries_by_user(user.id, limit=limit + 1, cursor=decoded_cursor)
+
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+
+        next_cursor = None
+        if has_next:
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        recipes = [
+            SavedRecipeSummaryResponse(
+                id=row.id,
+                food_name=row.food_name,
+                ingredient_names=row.ingredient_names or [],
+                created_at=row.created_at
+            )
+            for row in rows
+        ]
+        return SavedRecipeListResponse(recipes=recipes, next_cursor=next_cursor)
+
+    async def get_saved_recipe(self, recipe_id: int) -> str:   # JSON 문자열
         user = await self.get_current_user()
-        return await self.recipe_repo.get_recipes_by_user(user.id)
+
+        recipe = await self.recipe_repo.get_recipe_json(user.id, recipe_id)
+        if recipe is None:
+            raise RecipeNotFoundException(detail="해당 레시피가 존재하지 않습니다")
+        return recipe
 
     async def delete_recipe(self, recipe_id: int):
         user = await self.get_current_user()
 
         deleted = await self.recipe_repo.soft_delete_recipe(user.id, recipe_id)
         if not deleted:
-            from exception.recipe_exception import RecipeNotFoundException
             raise RecipeNotFoundException()
 
-    async def get_food_ranking(self, limit: int = 20):
-        return await self.recipe_repo.get_food_ranking(limit)
\ No newline at end of file
+    async def get_food_ranking(self, limit: int = 20, window: str = "all"):
+        return await self.recipe_repo.get_food_ranking(limit, window)
\ No newline at end of file
@@ -0,0 +1,87 @@
+import logging
+
+from core.config import settings
+from core.connection import RedisClient, RedisBacked
+from database.repository.user_repository import UserRepository
+from util.bloom_filter import bloom_parameters, bloom_positions
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("email", "nickname")
+READY_KEY = "user_bloom:ready"      # 전체 사용자로 구성이 끝났는지 (없으면 필터를 믿지 않고 DB 조회)
+REBUILD_LOCK_KEY = "user_bloom:rebuild"
+REBUILD_LOCK_SECONDS = 600
+
+
+class UserAvailability(RedisBacked):    # 이메일/닉네임 사용 여부 블룸 필터 (Redis 비트맵, 모든 서버가 공유)
+    # 필터에 없으면 DB 조회 없이 "사용 가능", 있으면 DB 로 다시 확인
+    # Redis 장애 / 구성 전에는 항상 DB 조회, 최종 가입은 필터와 관계없이 DB 로 확인
+
+    def __init__(self, capacity: int, error_rate: float, redis_getter=RedisClient.get_redis):
+        super().__init__(redis_getter)
+        self.size, self.hash_count = bloom_parameters(capacity, error_rate)
+
+    def _key(self, field: str) -> str:
+        return f"user_bloom:{field}"
+
+    async def _set_bits(self, redis, values: list[tuple[str, str]]):
+        async with redis.pipeline(transaction=False) as pipe:
+            for field, value in values:
+                for pos in bloom_positions(value, self.size, self.hash_count):
+                    pipe.setbit(self._key(field), pos, 1)
+            await pipe.execute()
+
+    async def rebuild(self, user_repo: UserRepository, batch_size: int = 5000) -> int | None:
+        # 이미 구성된 필터는 가입 때마다 갱신되므로 다시 만들지 않음 (Redis 초기화 등으로 없어졌을 때만)
+        redis = await self._redis()
+        if redis is None or await redis.exists(READY_KEY):
+            return None
+        if not await redis.set(REBUILD_LOCK_KEY, "1", nx=True, ex=REBUILD_LOCK_SECONDS):    # 다른 서버가 구성 중
+            return None
+
+        # 구성 중에 가입한 사용자도 add 로 같은 비트맵에 들어가므로 빠지는 사용자가 없음
+        count = 0
+        try:
+            async for rows in user_repo.iter_user_identities(batch_size):
+                await self._set_bits(redis, [(field, getattr(row, field)) for row in rows for field in FIELDS])
+                count += len(rows)
+            await redis.set(READY_KEY, "1")
+        finally:
+            await redis.delete(REBUILD_LOCK_KEY)
+        return count
+
+    async def add(self, email: str, nickname: str):
+        redis = await self._redis()
+        if redis is None:
+            return
+        try:
+            await self._set_bits(redis, [("email", email), ("nickname", nickname)])
+        except Exception:
+            # 반영하지 못한 값이 "사용 가능" 으로 보이지 않도록 필터를 구성 전 상태로 (재기동 시 다시 구성)
+            logger.warning("[UserAvailability] 필터 반영 실패, 필터 사용 중지")
+            self._redis_unavailable()
+            try:
+                await redis.delete(READY_KEY)
+            except Exception:
+                pass
+
+    async def might_exist(self, field: str, value: str) -> bool:
+        redis = await self._redis()
+        if redis is None:
+            return True
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.exists(READY_KEY)
+                for pos in bloom_positions(value, self.size, self.hash_count):
+                    pipe.getbit(self._key(field), pos)
+                ready, *bits = await pipe.execute()
+        except Exception:
+            self._redis_unavailable()
+            return True
+        return not ready or all(bits)
+
+
+user_availability = UserAvailability(
+    capacity=settings.USER_BLOOM_CAPACITY,
+    error_rate=settings.USER_BLOOM_ERROR_RATE,
+)
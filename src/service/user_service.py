@@ -1,10 +1,11 @@
-import bcrypt
 import hashlib
 import hmac
+import logging
+import uuid
 from base64 import urlsafe_b64encode
 
 from fastapi import Request
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 
 from core.config import settings
@@ -12,12 +13,19 @@ from database.repository.user_repository import UserRepository
 from exception.base_exception import UnexpectedException
 from schema.request import SignUpRequest, FindIdRequest, PassWordChangeRequest, LogInRequest
 from database.orm import User
-from schema.response import UserSchema, JWTResponse, FindIdResponse
+from schema.response import UserSchema, JWTResponse, FindIdResponse, AvailabilityResponse
+from service.auth.password_hasher import PasswordHasher, password_hasher as default_password_hasher
+from service.auth.principal import Principal, PrincipalCache, TokenVersionStore
+from service.auth.token_cache import VerifiedTokenCache
+from service.user_availability import UserAvailability
 from util.mask_email import mask_email
 
 from exception.user_exception import DuplicateEmailException, DuplicateNicknameException, TokenExpiredException, \
     InvalidCheckedPasswordException, InvalidCredentialsException, UserNotFoundException, IncorrectPasswordException, \
-    PasswordUnchangedException, PasswordMismatchException, PasswordLengthException, DuplicatePhoneNumException
+    PasswordUnchangedException, PasswordMismatchException, PasswordLengthException, DuplicatePhoneNumException, \
+    TokenStoreUnavailableException, UnauthorizedException
+
+logger = logging.getLogger(__name__)
 
 
 class UserService:
@@ -26,21 +34,21 @@ class UserService:
     secret_key = settings.JWT_SECRET_KEY.get_secret_value()
     jwt_algorithm = "HS256"
 
-    def __init__(self, user_repo: UserRepository):
+    def __init__(self, user_repo: UserRepository, principal_cache: PrincipalCache | None = None,
+                 token_versions: TokenVersionStore | None = None, password_hasher: PasswordHasher | None = None,
+                 availability: UserAvailability | None = None, token_cache: VerifiedTokenCache | None = None):
         self.user_repo = user_repo
+        self.principal_cache = principal_cache
+        self.token_versions = token_versions
+        self.password_hasher = password_hasher or default_password_hasher
+        self.availability = availability
+        self.token_cache = token_cache
 
-    def hash_password(self, plain_password: str) -> str:
-        hashed_password: bytes = bcrypt.hashpw(
-            plain_password.encode(self.encoding),
-            salt=bcrypt.gensalt(),
-        )
-        return hashed_password.decode(self.encoding)
+    async def hash_password(self, plain_password: str) -> str:     # 이벤트 루프를 막지 않도록 스레드 풀에서 실행
+        return await self.password_hasher.hash(plain_password)
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return bcrypt.checkpw(
-            plain_password.encode(self.encoding),
-            hashed_password.encode(self.encoding)
-        )
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.password_hasher.verify(plain_password, hashed_password)
 
     def _make_phone_digest(self, phone: str) -> str:
         mac = hmac.new(
@@ -51,57 +59,133 @@ class UserService:
         return urlsafe_b64encode(mac).decode(self.encoding)
 
 
-    def create_jwt(self, email: str) -> str:
+    def create_jwt(self, user: User, token_version: int = 0) -> str:
+        # 폐기 확인용 id/버전 포함 (상태/닉네임은 요청마다 PrincipalCache 의 최신 값 사용)
+        now = datetime.now(timezone.utc)
         return jwt.encode(
             {
-                "sub": email,
-                "exp": datetime.now() + timedelta(days=1),
+                "sub": user.email,
+                "uid": user.id,
+                "nickname": user.nickname,
+                "ver": token_version,   # 토큰 버전 (TokenVersionStore 의 값보다 작으면 무효)
+                "iat": now,
+                "jti": uuid.uuid4().hex,
+                "exp": now + timedelta(days=1),
             },
             self.secret_key,
             algorithm=self.jwt_algorithm,
         )
 
-    def decode_jwt(self, access_token: str) -> str:
+    # Redis 장애 정책: 토큰 버전을 읽거나 올리지 못하면 발급/검증/폐기 모두 TokenStoreUnavailableException (503)
+    # 폐기 여부를 확인할 수 없는 토큰은 받지 않고, 복구 후 바로 무효가 될 토큰도 발급하지 않음
+    async def issue_jwt(self, user: User) -> str:
+        token_version = await self.token_versions.get(user.id) if self.token_versions is not None else 0
+        await self._remember_principal(user)   # 로그인 직후 요청은 DB 를 다시 읽지 않음
+        return self.create_jwt(user, token_version)
+
+    async def revoke_tokens(self, user_id: int):   # 지금까지 발급한 토큰을 모두 무효화 (실패하면 예외 -> 요청 전체 롤백)
+        if self.token_versions is not None:
+            await self.token_versions.bump(user_id)
+
+    def decode_jwt(self, access_token: str) -> dict:
+        if self.token_cache is not None:
+            claims = self.token_cache.get(access_token)
+            if claims is not None:
+                return claims
+
         try:
             payload: dict = jwt.decode(
                 access_token, self.secret_key, algorithms=[self.jwt_algorithm]
             )
-            email = payload.get("sub")
 
-            if email is None:
+            if payload.get("sub") is None:
                 raise TokenExpiredException()
 
-            return email
+            if self.token_cache is not None:
+                self.token_cache.set(access_token, payload)
+            return payload
 
         except JWTError:
             raise TokenExpiredException()
 
-    async def get_user_by_token(self, access_token: str, req: Request) -> User:
-        email: str = self.decode_jwt(access_token=access_token)
+    async def get_user_by_token(self, access_token: str, req: Request) -> Principal:
+        claims = self.decode_jwt(access_token=access_token)
+
+        if "uid" in claims and self.token_versions is not None:     # 폐기된 토큰 확인 (이전 형식 토큰은 버전 없음)
+            current_version = await self.token_versions.get(claims["uid"])
+            if claims.get("ver", 0) < current_version:
+                raise TokenExpiredException()
+
+        # 상태/닉네임은 토큰 발급 시점이 아닌 최신 값으로 확인 (캐시 -> DB)
+        principal = await self._load_principal(claims["sub"])
+        if not principal.status:
+            raise UnauthorizedException(detail="비활성화된 계정입니다")
+        return principal
+
+    async def _load_principal(self, email: str) -> Principal:
+        if self.principal_cache is not None:
+            principal = await self.principal_cache.get(email)
+            if principal is not None:
+                return principal
+
         user: User | None = await self.user_repo.get_user_by_email(email=email)
 
         if not user:
             raise UserNotFoundException()
-        return user
+
+        return await self._remember_principal(user)
+
+    async def _remember_principal(self, user: User) -> Principal:
+        principal = Principal.from_user(user)
+        if self.principal_cache is not None:
+            await self.principal_cache.set(principal)
+        return principal
+
+    async def invalidate_principal(self, email: str):  # 비밀번호/상태/프로필 변경 후 호출
+        if self.principal_cache is not None:
+            await self.principal_cache.invalidate(email)
+
+    async def remember_user(self, user: User):     # 새로 가입한 사용자를 중복 확인 필터에 반영
+        if self.availability is not None:
+            await self.availability.add(user.email, user.nickname)
+
+    async def check_availability(self, email: str | None, nickname: str | None) -> AvailabilityResponse:
+        # 전화번호는 인증 없이 가입 여부를 알아낼 수 있어서 제외 (회원가입 시에만 확인)
+        values = {"email": email, "nickname": nickname}
+
+        # 필터에 없으면 확실히 사용 가능, 있을 수도 있는 값만 한 번에 DB 로 확인
+        maybe = {
+            field: value for field, value in values.items()
+            if value and (self.availability is None or await self.availability.might_exist(field, value))
+        }
+        taken = await self.user_repo.find_taken_fields(**maybe) if maybe else set()
+
+        return AvailabilityResponse(**{
+            field: field not in taken for field, value in values.items() if value
+        })
 
     async def sign_up(self, request: SignUpRequest):
 
         try:
-            if await self.user_repo.get_user_by_email(request.email):
+            phone_digest = self._make_phone_digest(request.phone_num)
+
+            # 최종 가입은 필터와 관계없이 한 번의 DB 조회로 확인 (에러 우선순위: 이메일 > 닉네임 > 비밀번호 확인 > 전화번호)
+            taken = await self.user_repo.find_taken_fields(request.email, request.nickname, phone_digest)
+
+            if "email" in taken:
                 raise DuplicateEmailException()
 
-            if await self.user_repo.get_user_by_nickname(request.nickname):
+            if "nickname" in taken:
                 raise DuplicateNicknameException()
 
             if request.password != request.checked_password:
                 raise InvalidCheckedPasswordException()
 
-            hashed_password = self.hash_password(request.password)
-            phone_digest = self._make_phone_digest(request.phone_num)
-
-            if await self.user_repo.get_user_by_phone_num(phone_digest):
+            if "phone_num" in taken:
                 raise DuplicatePhoneNumException()
 
+            hashed_password = await self.hash_password(request.password)
+
             user = User(
                 email=request.email,
                 password=hashed_password,
@@ -113,6 +197,7 @@ class UserService:
             )
 
             user = await self.user_repo.save_user(user)
+            await self.remember_user(user)
             return UserSchema.model_validate(user)
 
         except (DuplicateEmailException, DuplicateNicknameException, InvalidCheckedPasswordException, DuplicatePhoneNumException) as e:
@@ -125,25 +210,30 @@ class UserService:
         try:
             user = await self.user_repo.get_user_by_email(email=request.email)
 
-            if not user or not self.verify_password(request.password, user.password):
+            if not user or not await self.verify_password(request.password, user.password):
                 raise InvalidCredentialsException()
 
-            access_token = self.create_jwt(user.email)
+            access_token = await self.issue_jwt(user)
 
             return JWTResponse(access_token=access_token)
 
 
-        except InvalidCredentialsException:
+        except (InvalidCredentialsException, TokenStoreUnavailableException):
             raise
 
         except Exception as e:
             raise UnexpectedException(detail=f"로그인 중 예기치 못한 오류 발생: {str(e)}")
 
-    async def change_password(self, user: User, request: PassWordChangeRequest):
-        if not self.verify_password(request.current_password, user.password):
+    async def change_password(self, principal: Principal, request: PassWordChangeRequest):
+        user: User | None = await self.user_repo.get_user_by_email(email=principal.email)   # 비밀번호 확인용 전체 조회
+        if not user:
+            raise UserNotFoundException()
+
+        if not await self.verify_password(request.current_password, user.password):
             raise IncorrectPasswordException()
 
-        if self.verify_password(request.new_password, user.password):
+        # 현재 비밀번호가 맞으므로, 새 비밀번호가 같은지는 bcrypt 없이 문자열 비교로 충분
+        if request.new_password == request.current_password:
             raise PasswordUnchangedException()
 
         if request.new_password != request.confirm_password:
@@ -152,24 +242,22 @@ class UserService:
         if len(request.new_password) < 8 or len(request.new_password) > 20:
             raise PasswordLengthException()
 
-        hashed = self.hash_password(request.new_password)
+        hashed = await self.hash_password(request.new_password)
         await self.user_repo.update_password(user, hashed)
+        await self.invalidate_principal(user.email)
+        await self.revoke_tokens(user.id)   # 비밀번호 변경 전에 발급된 토큰은 더 이상 사용 불가
 
     async def find_id(self, request: FindIdRequest) -> str:
         try:
-            candidates = await self.user_repo.find_candidates_for_find_id(
+            email = await self.user_repo.find_email_for_find_id(
                 name=request.name,
                 birth=request.birth,
+                phone_num=self._make_phone_digest(request.phone_num),
             )
-            if not candidates:
+            if not email:
                 raise UserNotFoundException()
 
-            want = self._make_phone_digest(request.phone_num)
-            for u in candidates:
-                if u.phone_num and u.phone_num == want:
-                    return FindIdResponse(email=mask_email(u.email))
-
-            raise UserNotFoundException()
+            return FindIdResponse(email=mask_email(email))
 
         except UserNotFoundException:
             raise
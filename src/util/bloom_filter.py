@@ -0,0 +1,19 @@
+import hashlib
+import math
+
+# 블룸 필터 비트 위치 계산 (비트는 Redis 비트맵에 저장 -> 모든 서버가 같은 필터 사용)
+# 없으면 확실히 없음, 있으면 "있을 수도 있음" (오탐률 error_rate)
+
+
+def bloom_parameters(capacity: int, error_rate: float) -> tuple[int, int]:     # (비트 수, 해시 개수)
+    capacity = max(capacity, 1)
+    size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+    hash_count = max(1, round(size / capacity * math.log(2)))
+    return size, hash_count
+
+
+def bloom_positions(value: str, size: int, hash_count: int) -> list[int]:     # 해시 두 개로 k 개 위치 생성 (double hashing)
+    digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "big")
+    h2 = int.from_bytes(digest[8:], "big") | 1
+    return [(h1 + i * h2) % size for i in range(hash_count)]
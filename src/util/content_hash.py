@@ -0,0 +1,13 @@
+import hashlib
+import json
+from typing import Any
+
+# 같은 내용이면 키 순서/공백과 상관없이 같은 해시가 나오도록 정규화한 JSON 으로 해시
+
+
+def canonical_json(data: Any) -> str:
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def content_hash(data: Any) -> str:     # sha256 hex (64자)
+    return hashlib.sha256(canonical_json(data).encode("utf-8")).hexdigest()
@@ -0,0 +1,33 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import NamedTuple
+
+from exception.pagination_exception import InvalidCursorException
+
+# 키셋 페이지네이션용 커서 (created_at, id[, rank]) -> 불투명한 문자열
+
+
+class Cursor(NamedTuple):
+    created_at: datetime
+    id: int
+    rank: int | None = None     # 검색 결과일 때만 사용 (관련도 점수)
+
+
+def encode_cursor(created_at: datetime, row_id: int, rank: int | None = None) -> str:
+    values = [created_at.isoformat(), row_id]
+    if rank is not None:
+        values.append(rank)
+    payload = json.dumps(values, separators=(",", ":"))
+    return urlsafe_b64encode(payload.encode("utf-8")).decode("utf-8").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id, *rank = json.loads(urlsafe_b64decode(padded.encode("utf-8")))
+        if len(rank) > 1:
+            raise ValueError
+        return Cursor(datetime.fromisoformat(created_at), int(row_id), int(rank[0]) if rank else None)
+    except (ValueError, TypeError):
+        raise InvalidCursorException()
@@ -0,0 +1,15 @@
+import re
+import unicodedata
+
+# 한글은 공백 단위 토큰화가 의미가 없어서 2-gram(바이그램) 으로 색인
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(text: str | None) -> str:
+    return _WHITESPACE.sub("", unicodedata.normalize("NFC", text or "")).lower()
+
+
+def bigrams(text: str | None) -> set[str]:
+    normalized = normalize(text)
+    return {normalized[i:i + 2] for i in range(len(normalized) - 1)}
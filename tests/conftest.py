@@ -1,3 +1,4 @@
+from datetime import date
 from typing import AsyncGenerator
 
 import pytest_asyncio
@@ -7,6 +8,11 @@ from sqlalchemy.orm import sessionmaker
 
 from src.main import app
 from src.core.connection import get_postgres_db
+from src.database.repository.base_repository import unit_of_work
+from core.di import get_principal_cache, get_token_version_store, get_rate_limiter, get_user_availability
+from service.auth.principal import PrincipalCache, InMemoryTokenVersionStore
+from service.auth.rate_limiter import InMemoryRateLimiter
+from service.user_availability import UserAvailability
 
 #테스트용 DB 설정
 TEST_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
@@ -16,7 +22,8 @@ TEST_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 async def test_session() -> AsyncGenerator[AsyncSession, None]:
     engine = create_async_engine(TEST_SQLALCHEMY_DATABASE_URL)
     TestingSessionLocal = sessionmaker(
-        autocommit=False, autoflush=False, bind=engine, class_=AsyncSession
+        autocommit=False, autoflush=False, bind=engine, class_=AsyncSession,
+        expire_on_commit=False      # 운영 세션과 동일하게 커밋 후 객체를 만료시키지 않음
     )
 
     from src.database.orm import Base
@@ -36,9 +43,22 @@ async def test_session() -> AsyncGenerator[AsyncSession, None]:
 async def async_client(test_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
 
     async def override_get_db_session() -> AsyncGenerator[AsyncSession, None]:
-        yield test_session
+        async with unit_of_work(test_session):     # 운영과 같이 요청 단위로 한 번 커밋
+            yield test_session
+
+    async def no_redis():
+        raise ConnectionError("테스트에서는 Redis 를 사용하지 않음")
+
+    # 테스트마다 DB 를 새로 만들므로 인증 사용자 캐시도 테스트마다 새로 생성
+    principal_cache = PrincipalCache(ttl_seconds=30, max_size=100, redis_getter=no_redis)
 
     app.dependency_overrides[get_postgres_db] = override_get_db_session
+    app.dependency_overrides[get_principal_cache] = lambda: principal_cache
+    token_versions = InMemoryTokenVersionStore()
+    app.dependency_overrides[get_token_version_store] = lambda: token_versions
+    rate_limiter = InMemoryRateLimiter()
+    app.dependency_overrides[get_rate_limiter] = lambda: rate_limiter
+    app.dependency_overrides[get_user_availability] = lambda: UserAvailability(1000, 0.01, redis_getter=no_redis)  # 항상 DB 확인
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
@@ -46,3 +66,34 @@ async def async_client(test_session: AsyncSession) -> AsyncGenerator[AsyncClient
 
     app.dependency_overrides.clear()
 
+
+@pytest_asyncio.fixture(scope="function")
+async def make_auth_headers(async_client: AsyncClient):
+    # 가입 + 로그인 후 인증 헤더 반환 (사용자가 여러 명 필요하면 index 를 바꿔서 호출)
+    async def make(index: int = 0, **overrides) -> dict[str, str]:
+        user_data = {
+            "email": f"user{index}@example.com",
+            "password": "password1234",
+            "checked_password": "password1234",
+            "name": "테스트",
+            "nickname": f"user{index}",
+            "birth": date(1995, 1, 1).isoformat(),
+            "gender": "male",
+            "phone_num": f"0101000{index:04d}",
+            **overrides,
+        }
+        response = await async_client.post("/users/sign-up", json=user_data)
+        assert response.status_code == 201
+
+        login_response = await async_client.post("/users/log-in", json={
+            "email": user_data["email"],
+            "password": user_data["password"]
+        })
+        return {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+
+    return make
+
+
+@pytest_asyncio.fixture(scope="function")
+async def auth_headers(make_auth_headers) -> dict[str, str]:
+    return await make_auth_headers()
@@ -0,0 +1,393 @@
+import pytest
+import pytest_asyncio
+from datetime import datetime
+from unittest.mock import Mock
+from httpx import AsyncClient
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from database.orm import Board, BoardComment, BoardImage, BoardLikeCounterShard, User
+from database.repository.board_repository import BoardRepository
+from database.repository.board_search_repository import BoardSearchRepository
+from service.like_counter_folder import LikeCounterFolder
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestBoardListPagination:
+    """게시글 목록 키셋 페이지네이션 테스트"""
+
+    @pytest_asyncio.fixture(scope="function")
+    async def board_client(self, async_client: AsyncClient, test_session, auth_headers):
+        user_id = (await test_session.execute(select(User.id))).scalar_one()
+
+        # created_at 이 같은 게시글도 id 로 순서가 정해지는지 확인
+        created_at = [
+            datetime(2025, 1, 1, 12, 0, 0),
+            datetime(2025, 1, 2, 12, 0, 0),
+            datetime(2025, 1, 2, 12, 0, 0),
+            datetime(2025, 1, 3, 12, 0, 0),
+            datetime(2025, 1, 4, 12, 0, 0),
+        ]
+        for i, ts in enumerate(created_at):
+            title = f"김치찌개 {i}" if i % 2 == 0 else f"된장찌개 {i}"
+            test_session.add(Board(user_id=user_id, title=title, content="내용", created_at=ts))
+        await test_session.commit()
+        await BoardSearchRepository(test_session).index_missing_boards()
+
+        return async_client, auth_headers
+
+    async def test_list_follows_cursor_without_duplicates(self, board_client):
+        client, headers = board_client
+
+        titles = []
+        cursor = None
+        for _ in range(10):
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get("/board/list", params=params, headers=headers)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page["boards"]) <= 2
+            titles.extend(board["title"] for board in page["boards"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert titles == ["김치찌개 4", "된장찌개 3", "김치찌개 2", "된장찌개 1", "김치찌개 0"]
+
+    async def test_list_cursor_with_title_filter(self, board_client):
+        client, headers = board_client
+
+        first = await client.get("/board/list", params={"limit": 2, "title": "김치"}, headers=headers)
+        assert [b["title"] for b in first.json()["boards"]] == ["김치찌개 4", "김치찌개 2"]
+
+        second = await client.get(
+            "/board/list",
+            params={"limit": 2, "title": "김치", "cursor": first.json()["next_cursor"]},
+            headers=headers
+        )
+        assert [b["title"] for b in second.json()["boards"]] == ["김치찌개 0"]
+        assert second.json()["next_cursor"] is None
+
+    async def test_list_rejects_invalid_cursor_and_large_limit(self, board_client):
+        client, headers = board_client
+
+        response = await client.get("/board/list", params={"cursor": "invalid"}, headers=headers)
+        assert response.status_code == 400
+        assert response.json()["code"] == "INVALID_CURSOR"
+
+        response = await client.get("/board/list", params={"limit": 1000}, headers=headers)
+        assert response.status_code == 422
+
+
+class TestBoardSearch:
+    """게시글 제목/닉네임 바이그램 검색 테스트"""
+
+    @pytest_asyncio.fixture(scope="function")
+    async def search_client(self, async_client: AsyncClient, test_session, make_auth_headers):
+        headers = await make_auth_headers(nickname="요리왕")   # 닉네임 검색용
+
+        for day, title in enumerate(["참치 김치찌개", "김치찌개 끓이는 법", "김치볶음밥"], 1):
+            response = await async_client.post("/board", data={"title": title, "content": "내용"}, headers=headers)
+            assert response.status_code == 201
+            # 같은 초에 생성된 게시글의 정렬이 sqlite 에서 흔들리지 않도록 작성일 고정
+            await test_session.execute(
+                update(Board).where(Board.id == response.json()["board_id"]).values(created_at=datetime(2025, 1, day))
+            )
+        await test_session.commit()
+
+        return async_client, headers
+
+    async def test_search_ranks_by_matched_bigrams(self, search_client):
+        client, headers = search_client
+
+        response = await client.get("/board/list", params={"title": "참치김치찌개"}, headers=headers)
+        assert response.status_code == 200
+        assert [b["title"] for b in response.json()["boards"]] == ["참치 김치찌개", "김치찌개 끓이는 법"]
+
+    async def test_search_paginates_with_rank_cursor(self, search_client):
+        client, headers = search_client
+
+        titles = []
+        cursor = None
+        for _ in range(10):
+            params = {"limit": 1, "title": "김치찌개"}
+            if cursor:
+                params["cursor"] = cursor
+            page = (await client.get("/board/list", params=params, headers=headers)).json()
+            titles.extend(b["title"] for b in page["boards"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert titles == ["김치찌개 끓이는 법", "참치 김치찌개"]
+
+    async def test_search_by_nickname_and_short_query(self, search_client):
+        client, headers = search_client
+
+        response = await client.get("/board/list", params={"nickname": "요리"}, headers=headers)
+        assert len(response.json()["boards"]) == 3
+
+        # 1글자 검색어는 LIKE 로 처리
+        response = await client.get("/board/list", params={"title": "밥"}, headers=headers)
+        assert [b["title"] for b in response.json()["boards"]] == ["김치볶음밥"]
+
+    async def test_index_missing_boards(self, auth_headers, test_session):
+        user_id = (await test_session.execute(select(User.id))).scalar_one()
+        test_session.add(Board(user_id=user_id, title="된장찌개", content="내용"))
+        await test_session.commit()
+
+        search = BoardSearchRepository(test_session)
+        assert await search.index_missing_boards() == 1
+        assert await search.index_missing_boards() == 0
+
+
+class TestBoardLike:
+    """게시글 추천 원자적 증감 테스트"""
+
+    @pytest_asyncio.fixture(scope="function")
+    async def like_client(self, async_client: AsyncClient, auth_headers):
+        headers = auth_headers
+
+        response = await async_client.post("/board", data={"title": "추천할 글", "content": "내용"}, headers=headers)
+        return async_client, headers, response.json()["board_id"]
+
+    async def _like_count(self, client, headers, board_id):
+        response = await client.get(f"/board/{board_id}", headers=headers)
+        return response.json()["like_count"]
+
+    async def test_toggle_like(self, like_client):
+        client, headers, board_id = like_client
+
+        response = await client.post(f"/board/{board_id}/like", headers=headers)
+        assert response.json() == {"message": "게시글을 추천했습니다."}
+        assert await self._like_count(client, headers, board_id) == 1
+
+        response = await client.post(f"/board/{board_id}/like", headers=headers)
+        assert response.json() == {"message": "게시글 추천을 취소했습니다."}
+        assert await self._like_count(client, headers, board_id) == 0
+
+    async def test_put_and_delete_like_are_idempotent(self, like_client):
+        client, headers, board_id = like_client
+
+        for _ in range(2):
+            assert (await client.put(f"/board/{board_id}/like", headers=headers)).status_code == 204
+        assert await self._like_count(client, headers, board_id) == 1
+
+        for _ in range(2):
+            assert (await client.delete(f"/board/{board_id}/like", headers=headers)).status_code == 204
+        assert await self._like_count(client, headers, board_id) == 0
+
+    async def test_like_missing_or_deleted_board(self, like_client):
+        client, headers, board_id = like_client
+
+        assert (await client.put("/board/9999/like", headers=headers)).status_code == 404
+        assert (await client.post("/board/9999/like", headers=headers)).status_code == 404
+
+        await client.delete(f"/board/{board_id}", headers=headers)
+        assert (await client.put(f"/board/{board_id}/like", headers=headers)).status_code == 404
+        assert (await client.delete(f"/board/{board_id}/like", headers=headers)).status_code == 404
+
+    async def test_list_shows_liked_by_me(self, like_client):
+        client, headers, board_id = like_client
+
+        listed = await client.get("/board/list", headers=headers)
+        assert listed.json()["boards"][0]["liked_by_me"] is False
+
+        await client.put(f"/board/{board_id}/like", headers=headers)
+        listed = await client.get("/board/list", headers=headers)
+        assert listed.json()["boards"][0]["liked_by_me"] is True
+
+    async def test_like_updates_board_directly(self, like_client, test_session):
+        client, headers, board_id = like_client
+
+        await client.put(f"/board/{board_id}/like", headers=headers)
+
+        # 경합이 없으면 샤드 없이 board.like_count 를 바로 갱신
+        stored = await test_session.execute(select(Board.like_count).where(Board.id == board_id))
+        assert stored.scalar_one() == 1
+        shards = await test_session.execute(select(BoardLikeCounterShard))
+        assert shards.all() == []
+
+    async def test_locked_board_falls_back_to_shards(self, test_session):
+        from sqlalchemy.dialects import postgresql
+
+        repo = BoardRepository(test_session)
+        statements = []
+
+        async def record(stmt, *args, **kwargs):
+            statements.append(stmt)
+            return Mock(scalar_one_or_none=lambda: None)     # board 행이 잠겨 있어 갱신되지 않음
+
+        test_session.execute = record
+        await repo._change_like_count(1, 1)
+
+        assert "FOR UPDATE SKIP LOCKED" in str(statements[0].compile(dialect=postgresql.dialect()))
+        assert statements[1].table.name == "board_like_counter_shard"
+
+    async def test_like_counter_shards_fold_into_board(self, like_client, test_session):
+        client, headers, board_id = like_client
+
+        folder = LikeCounterFolder(async_sessionmaker(test_session.bind, expire_on_commit=False), fold_interval_ms=1000)
+        assert await folder.fold() == 0     # 샤드가 없으면 바로 종료
+
+        await client.put(f"/board/{board_id}/like", headers=headers)
+        test_session.add(BoardLikeCounterShard(board_id=board_id, shard=3, delta=1))    # 경합 중 다른 요청이 남긴 증감
+        await test_session.commit()
+
+        # 반영 전에는 board.like_count 는 그대로, 조회 시 샤드 증감을 더해서 보여줌
+        stored = await test_session.execute(select(Board.like_count).where(Board.id == board_id))
+        assert stored.scalar_one() == 1
+        assert await self._like_count(client, headers, board_id) == 2
+        listed = await client.get("/board/list", headers=headers)
+        assert listed.json()["boards"][0]["like_count"] == 2
+
+        await folder.stop()
+
+        stored = await test_session.execute(select(Board.like_count).where(Board.id == board_id))
+        assert stored.scalar_one() == 2
+        shards = await test_session.execute(select(BoardLikeCounterShard))
+        assert shards.all() == []
+        assert await self._like_count(client, headers, board_id) == 2
+
+
+class TestBoardDetail:
+    """게시글 상세 단일 쿼리 조회 및 존재/작성자 확인 테스트"""
+
+    @pytest_asyncio.fixture(scope="function")
+    async def detail_client(self, async_client: AsyncClient, test_session, make_auth_headers):
+        headers = [await make_auth_headers(i) for i in range(2)]   # 작성자, 다른 사용자
+
+        response = await async_client.post("/board", data={"title": "사진 있는 글", "content": "내용"}, headers=headers[0])
+        board_id = response.json()["board_id"]
+        test_session.add_all([
+            BoardImage(board_id=board_id, image_url="https://example.com/1.png"),
+            BoardImage(board_id=board_id, image_url="https://example.com/2.png"),
+        ])
+        await test_session.commit()
+
+        return async_client, headers, board_id
+
+    async def test_detail_includes_author_and_images(self, detail_client):
+        client, headers, board_id = detail_client
+
+        response = await client.get(f"/board/{board_id}", headers=headers[1])
+        assert response.status_code == 200
+        body = response.json()
+        assert body["author"]["nickname"] == "user0"
+        assert sorted(body["image_urls"]) == ["https://example.com/1.png", "https://example.com/2.png"]
+
+    async def test_detail_without_images(self, detail_client):
+        client, headers, _ = detail_client
+
+        response = await client.post("/board", data={"title": "글만", "content": "내용"}, headers=headers[0])
+        detail = await client.get(f"/board/{response.json()['board_id']}", headers=headers[0])
+        assert detail.json()["image_urls"] == []
+
+    async def test_repository_caches_board_within_request(self, detail_client, test_session):
+        _, _, board_id = detail_client
+
+        repo = BoardRepository(test_session)
+        board = await repo.get_board(board_id)
+        assert await repo.get_board(board_id) is board
+        assert await repo.get_board_owner_id(board_id) == board.user_id
+        assert await repo.get_board(9999) is None
+
+    async def test_delete_checks_owner(self, detail_client):
+        client, headers, board_id = detail_client
+
+        response = await client.delete(f"/board/{board_id}", headers=headers[1])
+        assert response.json()["code"] == "HAVE_NOT_PERMISSION"
+
+        assert (await client.delete(f"/board/{board_id}", headers=headers[0])).status_code == 204
+        assert (await client.get(f"/board/{board_id}", headers=headers[0])).status_code == 404
+        assert (await client.get(f"/board/{board_id}/comments", headers=headers[0])).status_code == 404
+
+
+class TestBoardComment:
+    """댓글 키셋 페이지네이션 및 댓글 수 테스트"""
+
+    @pytest_asyncio.fixture(scope="function")
+    async def comment_client(self, async_client: AsyncClient, test_session, auth_headers):
+        headers = auth_headers
+
+        response = await async_client.post("/board", data={"title": "댓글 달린 글", "content": "내용"}, headers=headers)
+        board_id = response.json()["board_id"]
+
+        comment_ids = []
+        for i in range(3):
+            response = await async_client.post(f"/board/{board_id}/comment", data={"comment": f"댓글 {i}"}, headers=headers)
+            assert response.status_code == 201
+            comment_ids.append(response.json()["id"])
+        # 같은 초에 작성된 댓글의 정렬이 sqlite 에서 흔들리지 않도록 작성일 고정
+        for i, comment_id in enumerate(comment_ids):
+            await test_session.execute(
+                update(BoardComment).where(BoardComment.id == comment_id).values(created_at=datetime(2025, 1, 1, 12, i))
+            )
+        await test_session.commit()
+
+        return async_client, headers, board_id, comment_ids
+
+    async def test_comments_follow_cursor(self, comment_client):
+        client, headers, board_id, _ = comment_client
+
+        first = (await client.get(f"/board/{board_id}/comments", params={"limit": 2}, headers=headers)).json()
+        assert [c["comment"] for c in first["comments"]] == ["댓글 0", "댓글 1"]
+        assert first["next_cursor"] is not None
+
+        second = (await client.get(
+            f"/board/{board_id}/comments", params={"limit": 2, "cursor": first["next_cursor"]}, headers=headers
+        )).json()
+        assert [c["comment"] for c in second["comments"]] == ["댓글 2"]
+        assert second["next_cursor"] is None
+
+    async def test_comment_count_follows_create_and_delete(self, comment_client):
+        client, headers, _, comment_ids = comment_client
+
+        listed = await client.get("/board/list", headers=headers)
+        assert listed.json()["boards"][0]["comment_count"] == 3
+
+        assert (await client.delete(f"/board/comment/{comment_ids[0]}", headers=headers)).status_code == 204
+        assert (await client.delete(f"/board/comment/{comment_ids[0]}", headers=headers)).status_code == 404
+
+        listed = await client.get("/board/list", headers=headers)
+        assert listed.json()["boards"][0]["comment_count"] == 2
+
+    async def test_backfill_and_clamp_comment_count(self, comment_client, test_session):
+        client, headers, board_id, comment_ids = comment_client
+
+        # comment_count 추가 이전 게시글처럼 0 으로 되돌림
+        await test_session.execute(update(Board).where(Board.id == board_id).values(comment_count=0))
+        await test_session.commit()
+
+        assert await BoardRepository(test_session).backfill_comment_counts(batch_size=1) == 1
+        assert await BoardRepository(test_session).backfill_comment_counts() == 0   # 이미 맞으면 갱신 없음
+        listed = await client.get("/board/list", headers=headers)
+        assert listed.json()["boards"][0]["comment_count"] == 3
+
+        await test_session.execute(update(Board).where(Board.id == board_id).values(comment_count=0))
+        await test_session.commit()
+        assert (await client.delete(f"/board/comment/{comment_ids[0]}", headers=headers)).status_code == 204
+        listed = await client.get("/board/list", headers=headers)
+        assert listed.json()["boards"][0]["comment_count"] == 0     # 음수가 되지 않음
+
+    async def test_create_comment_returns_server_defaults_without_select(self, comment_client, test_session):
+        _, _, board_id, _ = comment_client
+        user_id = (await test_session.execute(select(Board.user_id).where(Board.id == board_id))).scalar_one()
+
+        statements = []
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = test_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            comment = await BoardRepository(test_session).create_comment(user_id=user_id, board_id=board_id, comment="새 댓글")
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        # id/created_at/status 는 INSERT ... RETURNING 으로 받아오므로 refresh 용 SELECT 가 없음
+        assert comment.id is not None and comment.created_at is not None and comment.status is True
+        assert not [s for s in statements if s.lstrip().upper().startswith("SELECT")]
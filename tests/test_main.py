@@ -10,3 +10,20 @@ def test_read_root():
 
     assert response.status_code == 200
     assert response.json() == {"Hello": "World"}
+
+
+def test_read_metrics(monkeypatch):
+    from pydantic import SecretStr
+    from core.config import settings
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", None)
+    assert client.get("/metrics").status_code == 404     # 토큰을 설정하지 않으면 비활성화
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", SecretStr("metrics-secret"))
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 404
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer metrics-secret"})
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"counters", "timings"}
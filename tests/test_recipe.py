@@ -1,9 +1,17 @@
 import pytest
+import pytest_asyncio
 import json
 from unittest.mock import AsyncMock, Mock, patch
 import httpx
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, func, update, text
+from sqlalchemy.exc import DataError
+from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from core.config import settings
+from database.orm import FoodRanking, FoodRankingDaily, LikeRecipe, RecipeContent, User
+from database.repository.recipe_repository import RecipeRepository, ranking_today
+from service.food_ranking_buffer import FoodRankingBuffer
 from service.recipe_service import FoodThingAIService
 from exception.foodthing_exception import (
     AIServiceException,
@@ -339,4 +347,266 @@ class TestGetSearchRecipe:
             result = await ai_service.get_search_recipe(chat)
 
             assert result["food"] == "된장찌개"
-            assert "tip" in result
\ No newline at end of file
+            assert "tip" in result
+
+    @pytest.mark.asyncio
+    async def test_get_search_recipe_buffers_ranking_event(self, ai_service):
+        ai_service.ranking_buffer = Mock()
+
+        with patch.object(ai_service, '_call_ollama', new_callable=AsyncMock) as mock_call:
+            mock_call.return_value = {"error": "정확한 음식명을 입력해 주세요."}
+
+            await ai_service.get_search_recipe(" 된장찌개 ")
+
+        ai_service.ranking_buffer.add.assert_called_once_with("된장찌개")
+
+
+class TestFoodRanking:
+
+    @pytest.mark.asyncio
+    async def test_ranking_windows(self, test_session):
+        repo = RecipeRepository(test_session)
+        today = ranking_today()
+
+        await repo.increment_food_counts({"김치찌개": 1, "된장찌개": 2}, day=today)
+        await repo.increment_food_counts({"김치찌개": 1}, day=today)
+        await repo.increment_food_counts({"김치찌개": 5}, day=today - timedelta(days=3))
+        await repo.increment_food_counts({"비빔밥": 10}, day=today - timedelta(days=10))
+        await test_session.commit()
+
+        assert await repo.get_food_ranking(window="daily") == [
+            {"food_name": "김치찌개", "count": 2},
+            {"food_name": "된장찌개", "count": 2},
+        ]
+        assert await repo.get_food_ranking(window="weekly") == [
+            {"food_name": "김치찌개", "count": 7},
+            {"food_name": "된장찌개", "count": 2},
+        ]
+        assert await repo.get_food_ranking(limit=2, window="all") == [
+            {"food_name": "비빔밥", "count": 10},
+            {"food_name": "김치찌개", "count": 7},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_compact_raw_ranking_log(self, test_session):
+        repo = RecipeRepository(test_session)
+        now = datetime.now(timezone.utc)
+        test_session.add_all([
+            FoodRanking(food_name="김치찌개", created_at=now),
+            FoodRanking(food_name="김치찌개", created_at=now - timedelta(days=1)),
+            FoodRanking(food_name="떡볶이", created_at=now),
+        ])
+        await repo.increment_food_counts({"김치찌개": 1})
+        await test_session.commit()
+
+        assert await repo.compact_food_ranking() == 3
+        assert (await test_session.execute(select(func.count(FoodRanking.id)))).scalar() == 0
+        assert await repo.get_food_ranking(window="all") == [
+            {"food_name": "김치찌개", "count": 3},
+            {"food_name": "떡볶이", "count": 1},
+        ]
+        assert await repo.get_food_ranking(window="daily") == [
+            {"food_name": "김치찌개", "count": 2},
+            {"food_name": "떡볶이", "count": 1},
+        ]
+
+
+
+class TestFoodRankingBuffer:
+
+    @pytest.mark.asyncio
+    async def test_flush_and_stop(self, test_session):
+        session_factory = async_sessionmaker(test_session.bind, expire_on_commit=False)
+        buffer = FoodRankingBuffer(session_factory, flush_interval_ms=60000, max_events=100)
+
+        buffer.add("김치찌개")
+        buffer.add("김치찌개")
+        buffer.add("")
+        assert await buffer.flush() == 2
+        assert await buffer.flush() == 0
+
+        buffer.start()
+        buffer.add("떡볶이")
+        await buffer.stop()     # 종료 시 남은 이벤트 반영
+
+        assert await RecipeRepository(test_session).get_food_ranking(window="all") == [
+            {"food_name": "김치찌개", "count": 2},
+            {"food_name": "떡볶이", "count": 1},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_flush_prunes_expired_daily_counts_once_a_day(self, test_session):
+        session_factory = async_sessionmaker(test_session.bind, expire_on_commit=False)
+        buffer = FoodRankingBuffer(session_factory, flush_interval_ms=60000, max_events=100)
+
+        test_session.add_all([
+            FoodRankingDaily(day=ranking_today() - timedelta(days=40), food_name="오래된음식", count=5),
+            FoodRankingDaily(day=ranking_today() - timedelta(days=1), food_name="김치찌개", count=1),
+        ])
+        await test_session.commit()
+
+        assert await buffer.flush() == 0   # 기동한 날에는 정리하지 않음 (기동 시 압축에서 정리)
+        buffer._pruned_on = ranking_today() - timedelta(days=1)     # 날짜가 바뀐 뒤
+        assert await buffer.flush() == 0
+
+        days = (await test_session.execute(select(FoodRankingDaily.food_name))).scalars().all()
+        assert days == ["김치찌개"]
+        assert buffer._pruned_on == ranking_today()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_events(self):
+        session_factory = Mock(side_effect=ConnectionRefusedError("DB down"))
+        buffer = FoodRankingBuffer(session_factory, flush_interval_ms=60000, max_events=100)
+
+        buffer.add("김치찌개")
+        with pytest.raises(ConnectionRefusedError):
+            await buffer.flush()
+
+        assert buffer._pending == 1
+
+    @pytest.mark.asyncio
+    async def test_data_error_drops_events(self):
+        session_factory = Mock(side_effect=DataError("INSERT", {}, Exception("value too long")))
+        buffer = FoodRankingBuffer(session_factory, flush_interval_ms=60000, max_events=100)
+
+        buffer.add("김치찌개")
+        with pytest.raises(DataError):
+            await buffer.flush()
+
+        assert buffer._pending == 0     # 다음 flush 를 막지 않도록 버림
+        assert await buffer.flush() == 0
+
+    @pytest.mark.asyncio
+    async def test_long_food_name_is_skipped(self, test_session):
+        session_factory = async_sessionmaker(test_session.bind, expire_on_commit=False)
+        buffer = FoodRankingBuffer(session_factory, flush_interval_ms=60000, max_events=100)
+
+        buffer.add("냉장고에 있는 재료로 만들 수 있는 아주 간단하고 맛있는 저녁 메뉴를 추천해줘")    # 검색어 원문
+        buffer.add("  김치   찌개 ")
+        assert await buffer.flush() == 1
+
+        assert await RecipeRepository(test_session).get_food_ranking(window="all") == [
+            {"food_name": "김치 찌개", "count": 1},
+        ]
+
+
+class TestSavedRecipe:
+
+    RECIPE = {
+        "food": "김치 볶음밥",
+        "use_ingredients": [{"name": "김치", "amount": "200g"}, {"name": "밥", "amount": "2공기"}],
+        "steps": ["김치를 썰어줍니다.", "밥과 함께 볶습니다."],
+        "tip": None
+    }
+
+    @pytest_asyncio.fixture
+    async def recipe_client(self, async_client, auth_headers):
+        return async_client, auth_headers
+
+    @pytest.mark.asyncio
+    async def test_save_and_list_recipes(self, recipe_client):
+        client, headers = recipe_client
+
+        response = await client.post("/recipe/like", json=self.RECIPE, headers=headers)
+        assert response.status_code == 201
+        saved = response.json()
+        assert saved["recipe"] == self.RECIPE
+
+        response = await client.get("/recipe/like", headers=headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == [{"id": saved["id"], "recipe": self.RECIPE}]
+
+        await client.patch(f"/recipe/like/{saved['id']}", headers=headers)
+        assert (await client.get("/recipe/like", headers=headers)).json() == []
+
+    @pytest.mark.asyncio
+    async def test_save_long_food_name(self, recipe_client, test_session):
+        client, headers = recipe_client
+        recipe = {**self.RECIPE, "food": "김치 " * 60}
+
+        response = await client.post("/recipe/like", json=recipe, headers=headers)
+        assert response.status_code == 201
+        assert RecipeContent.__table__.c.food_name.type.length is None     # 길이 제한 없음 (postgres 에서 길이 초과 오류 방지)
+
+    @pytest.mark.asyncio
+    async def test_summary_pages_and_detail(self, recipe_client, test_session):
+        client, headers = recipe_client
+
+        ids = []
+        for i, food in enumerate(["김치 볶음밥", "된장찌개", "계란말이"]):
+            response = await client.post("/recipe/like", json={**self.RECIPE, "food": food}, headers=headers)
+            ids.append(response.json()["id"])
+            # 같은 초에 저장된 레시피의 정렬이 sqlite 에서 흔들리지 않도록 저장일 고정
+            await test_session.execute(
+                update(LikeRecipe).where(LikeRecipe.id == ids[-1]).values(created_at=datetime(2025, 1, 1 + i))
+            )
+        await test_session.commit()
+
+        first = (await client.get("/recipe/like/summary", params={"limit": 2}, headers=headers)).json()
+        assert [r["food_name"] for r in first["recipes"]] == ["계란말이", "된장찌개"]
+        assert first["recipes"][0]["ingredient_names"] == ["김치", "밥"]
+        assert "recipe" not in first["recipes"][0]
+
+        second = (await client.get(
+            "/recipe/like/summary", params={"limit": 2, "cursor": first["next_cursor"]}, headers=headers
+        )).json()
+        assert [r["food_name"] for r in second["recipes"]] == ["김치 볶음밥"]
+        assert second["next_cursor"] is None
+
+        detail = await client.get(f"/recipe/like/{ids[1]}", headers=headers)
+        assert detail.json() == {"id": ids[1], "recipe": {**self.RECIPE, "food": "된장찌개"}}
+        assert (await client.get("/recipe/like/9999", headers=headers)).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_duplicate_save_is_deduplicated(self, recipe_client, test_session):
+        client, headers = recipe_client
+
+        first = (await client.post("/recipe/like", json=self.RECIPE, headers=headers)).json()
+        # 키 순서가 달라도 같은 레시피
+        reordered = dict(reversed(list(self.RECIPE.items())))
+        second = (await client.post("/recipe/like", json=reordered, headers=headers)).json()
+        assert second["id"] == first["id"]
+
+        # 삭제 후 다시 저장하면 같은 행을 되살림
+        await client.patch(f"/recipe/like/{first['id']}", headers=headers)
+        third = (await client.post("/recipe/like", json=self.RECIPE, headers=headers)).json()
+        assert third["id"] == first["id"]
+        assert len((await client.get("/recipe/like", headers=headers)).json()) == 1
+
+        assert (await test_session.execute(select(func.count()).select_from(RecipeContent))).scalar() == 1
+        assert (await test_session.execute(select(func.count()).select_from(LikeRecipe))).scalar() == 1
+
+    @pytest.mark.asyncio
+    async def test_backfill_legacy_saved_recipes(self, recipe_client, test_session):
+        client, headers = recipe_client
+        user_id = (await test_session.execute(select(User.id))).scalar_one()
+
+        # recipe_content 도입 이전 형태의 like_recipe (본문을 행마다 저장)
+        await test_session.execute(text("DROP TABLE like_recipe"))
+        await test_session.execute(text(
+            "CREATE TABLE like_recipe (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, recipe JSON NOT NULL, "
+            "status BOOLEAN NOT NULL DEFAULT 1, created_at TIMESTAMP NOT NULL, content_hash VARCHAR(64))"
+        ))
+        reordered = dict(reversed(list(self.RECIPE.items())))
+        legacy = [
+            (1, self.RECIPE, False, "2025-01-01 00:00:00"),
+            (2, reordered, True, "2025-01-02 00:00:00"),   # 같은 레시피를 다시 저장 (키 순서만 다름)
+            (3, {**self.RECIPE, "food": "된장찌개"}, True, "2025-01-03 00:00:00"),
+        ]
+        for row_id, recipe, status, created_at in legacy:
+            await test_session.execute(
+                text("INSERT INTO like_recipe (id, user_id, recipe, status, created_at) VALUES (:id, :user_id, :recipe, :status, :created_at)"),
+                {"id": row_id, "user_id": user_id, "recipe": json.dumps(recipe, ensure_ascii=False), "status": status, "created_at": created_at}
+            )
+        await test_session.commit()
+
+        assert await RecipeRepository(test_session).backfill_recipe_contents(batch_size=2) == 3
+        assert await RecipeRepository(test_session).backfill_recipe_contents() == 0     # 다시 실행해도 그대로
+
+        assert (await test_session.execute(select(func.count()).select_from(RecipeContent))).scalar() == 2
+        response = await client.get("/recipe/like", headers=headers)
+        assert response.json() == [
+            {"id": 3, "recipe": {**self.RECIPE, "food": "된장찌개"}},
+            {"id": 2, "recipe": self.RECIPE},     # 중복 저장은 활성/최신 한 건만 남김
+        ]
@@ -0,0 +1,106 @@
+import pytest
+from datetime import date
+from sqlalchemy import event, select, func
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from database.orm import User
+from core.metrics import metrics
+from database.repository.base_repository import unit_of_work
+from exception.database_exception import DatabaseException
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_user(email: str, nickname: str) -> User:
+    return User(
+        email=email, password="hashed", name="트랜잭션", nickname=nickname,
+        birth=date(1990, 1, 1), gender="male", phone_num=None
+    )
+
+
+async def count_users(session) -> int:
+    return (await session.execute(select(func.count(User.id)))).scalar()
+
+
+async def test_commits_once_at_end(test_session):
+    commits = []
+    event.listen(test_session.sync_session, "after_commit", commits.append)
+
+    async with unit_of_work(test_session):
+        test_session.add(make_user("uow1@example.com", "uow1"))
+        await test_session.flush()
+        test_session.add(make_user("uow2@example.com", "uow2"))
+
+    assert len(commits) == 1
+    assert await count_users(test_session) == 2
+
+
+async def test_rolls_back_on_exception(test_session):
+    with pytest.raises(RuntimeError):
+        async with unit_of_work(test_session):
+            test_session.add(make_user("uow@example.com", "uow"))
+            await test_session.flush()
+            raise RuntimeError("요청 실패")
+
+    assert await count_users(test_session) == 0
+
+
+async def test_commit_errors_are_mapped(test_session):
+    with pytest.raises(DatabaseException):
+        async with unit_of_work(test_session):
+            test_session.add(make_user("dup@example.com", "dup1"))
+            test_session.add(make_user("dup@example.com", "dup2"))
+
+    assert await count_users(test_session) == 0
+
+
+async def test_request_commits_once(async_client, test_session):
+    await async_client.post("/users/sign-up", json={
+        "email": "uow_req@example.com",
+        "password": "uow12345",
+        "checked_password": "uow12345",
+        "name": "트랜잭션",
+        "nickname": "uow_req",
+        "birth": date(1990, 1, 1).isoformat(),
+        "gender": "male",
+        "phone_num": "01090909090"
+    })
+    login = await async_client.post("/users/log-in", json={"email": "uow_req@example.com", "password": "uow12345"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    board = await async_client.post("/board", data={"title": "트랜잭션", "content": "내용"}, headers=headers)
+
+    commits = []
+    event.listen(test_session.sync_session, "after_commit", commits.append)
+    response = await async_client.post(f"/board/{board.json()['board_id']}/comment", data={"comment": "댓글"}, headers=headers)
+
+    assert response.status_code == 201
+    assert len(commits) == 1
+
+
+async def test_route_without_query_never_checks_out_connection(async_client, test_session, monkeypatch):
+    import src.core.connection as connection
+    from src.main import app
+
+    # 실제 get_postgres_db 를 테스트 DB 엔진으로 사용하고 풀의 커넥션 대여 횟수를 셈
+    monkeypatch.setattr(connection, "AsyncSessionLocal", async_sessionmaker(test_session.bind, expire_on_commit=False))
+    app.dependency_overrides.pop(connection.get_postgres_db)
+    connection.count_connection_checkouts(test_session.bind)
+    metrics.reset()
+
+    response = await async_client.post("/board", data={"title": "제목", "content": "내용"})   # 토큰 없음 -> 쿼리 전에 실패
+    assert response.status_code == 401
+    assert "db_connection_checkout" not in metrics.snapshot()["counters"]
+
+    response = await async_client.post("/users/sign-up", json={
+        "email": "lazy_route@example.com",
+        "password": "lazy1234",
+        "checked_password": "lazy1234",
+        "name": "커넥션",
+        "nickname": "lazy_route",
+        "birth": date(1990, 1, 1).isoformat(),
+        "gender": "male",
+        "phone_num": "01080808080"
+    })
+    assert response.status_code == 201
+    counters = metrics.snapshot()["counters"]
+    assert counters["db_connection_checkout"] == counters["db_connection_checkin"] == 1    # 요청 하나에 커넥션 하나
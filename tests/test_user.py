@@ -1,7 +1,22 @@
+import asyncio
 import pytest
+from unittest.mock import AsyncMock, Mock
 from httpx import AsyncClient
 from datetime import date
 
+from datetime import datetime, timedelta, timezone
+from jose import jwt
+from sqlalchemy import event
+
+from core.metrics import metrics
+from exception.user_exception import TokenExpiredException, TokenStoreUnavailableException, UnauthorizedException
+from service.auth.password_hasher import PasswordHasher
+from service.auth.principal import Principal, PrincipalCache, TokenVersionStore
+from service.auth.token_cache import VerifiedTokenCache
+from service.user_availability import UserAvailability
+from service.user_service import UserService
+from util.bloom_filter import bloom_parameters, bloom_positions
+
 pytestmark = pytest.mark.asyncio
 
 
@@ -92,4 +107,479 @@ class TestUserAuth:
         response = await async_client.post(self.LOG_IN_URL, json=login_data)
 
         assert response.status_code == 401
-        assert response.json()["detail"] == "이메일 또는 비밀번호가 잘못되었습니다"
\ No newline at end of file
+        assert response.json()["detail"] == "이메일 또는 비밀번호가 잘못되었습니다"
+
+    async def test_user_find_id(self, async_client: AsyncClient):
+        await async_client.post(self.SIGN_UP_URL, json=self.user_data)
+        find_data = {k: self.user_data[k] for k in ("name", "birth", "phone_num")}
+
+        response = await async_client.post("/users/find-id", json=find_data)
+        assert response.status_code == 200
+        assert response.json()["email"]["email"] == "t**t@example.com"
+
+        # 전화번호는 맞지만 이름이 다르면 찾지 못함
+        response = await async_client.post("/users/find-id", json={**find_data, "name": "다른이름"})
+        assert response.status_code == 404
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+    async def incr(self, key):
+        self.store[key] = str(int(self.store.get(key, 0)) + 1)
+        return int(self.store[key])
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def exists(self, key):
+        return int(key in self.store)
+
+    async def setbit(self, key, offset, value):
+        self.store.setdefault(key, set()).add(offset)
+
+    async def getbit(self, key, offset):
+        return int(offset in self.store.get(key, ()))
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:     # 명령을 모았다가 execute 때 한 번에 실행
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args) for name, args in self.commands]
+
+
+class TestPrincipalCache:
+
+    principal = Principal(id=1, email="cache@example.com", nickname="cache_user", status=True)
+
+    async def test_local_lru_evicts_oldest(self):
+        async def no_redis():
+            raise ConnectionError()
+
+        cache = PrincipalCache(ttl_seconds=30, max_size=2, redis_getter=no_redis)
+        for i in range(3):
+            await cache.set(Principal(id=i, email=f"u{i}@example.com", nickname=f"u{i}", status=True))
+
+        assert await cache.get("u0@example.com") is None
+        assert (await cache.get("u2@example.com")).id == 2
+
+    async def test_falls_back_to_redis_and_invalidates(self):
+        redis = FakeRedis()
+
+        async def get_redis():
+            return redis
+
+        cache = PrincipalCache(ttl_seconds=30, max_size=10, redis_getter=get_redis)
+        await cache.set(self.principal)
+
+        # 다른 프로세스(로컬 캐시가 빈 상태)도 Redis 에서 가져옴
+        other = PrincipalCache(ttl_seconds=30, max_size=10, redis_getter=get_redis)
+        assert await other.get(self.principal.email) == self.principal
+
+        await cache.invalidate(self.principal.email)
+        assert await cache.get(self.principal.email) is None
+        assert redis.store == {}
+
+    async def test_get_user_by_token_uses_cache(self):
+        async def no_redis():
+            raise ConnectionError()
+
+        user = Mock(id=1, email="cache@example.com", nickname="cache_user", status=True)
+        user_repo = AsyncMock()
+        user_repo.get_user_by_email.return_value = user
+        service = UserService(user_repo, principal_cache=PrincipalCache(ttl_seconds=30, max_size=10, redis_getter=no_redis))
+        # 사용자 정보가 없는 이전 형식 토큰은 캐시/DB 로 조회
+        token = jwt.encode(
+            {"sub": user.email, "exp": datetime.now(timezone.utc) + timedelta(hours=1)},
+            service.secret_key, algorithm=service.jwt_algorithm
+        )
+
+        first = await service.get_user_by_token(token, Mock())
+        second = await service.get_user_by_token(token, Mock())
+
+        assert first == second == self.principal
+        user_repo.get_user_by_email.assert_awaited_once()
+
+        await service.invalidate_principal(user.email)
+        await service.get_user_by_token(token, Mock())
+        assert user_repo.get_user_by_email.await_count == 2
+
+    async def test_change_password_invalidates_cache(self, async_client: AsyncClient):
+        user_data = {**TestUserAuth.user_data, "email": "pw@example.com", "nickname": "pw_user", "phone_num": "01055550000"}
+        await async_client.post("/users/sign-up", json=user_data)
+        login = await async_client.post("/users/log-in", json={"email": user_data["email"], "password": user_data["password"]})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        response = await async_client.patch("/users/change-pw", json={
+            "current_password": user_data["password"],
+            "new_password": "newpassword1",
+            "confirm_password": "newpassword1"
+        }, headers=headers)
+        assert response.status_code == 204
+
+        login = await async_client.post("/users/log-in", json={"email": user_data["email"], "password": "newpassword1"})
+        assert login.status_code == 200
+
+
+class TestJWTPrincipal:
+
+    user = Mock(id=7, email="jwt@example.com", nickname="jwt_user", status=True)
+
+    async def test_principal_comes_from_cache_not_claims(self):
+        async def no_redis():
+            raise ConnectionError()
+
+        user_repo = AsyncMock()
+        cache = PrincipalCache(ttl_seconds=30, max_size=10, redis_getter=no_redis)
+        service = UserService(user_repo, principal_cache=cache)
+
+        token = await service.issue_jwt(self.user)
+        claims = service.decode_jwt(token)
+        assert {"sub", "uid", "nickname", "ver", "iat", "jti", "exp"} <= claims.keys()
+
+        # 발급 시 캐시에 넣어 두므로 DB 조회 없음
+        principal = await service.get_user_by_token(token, Mock())
+        assert principal == Principal(id=7, email="jwt@example.com", nickname="jwt_user", status=True)
+        user_repo.get_user_by_email.assert_not_awaited()
+
+        # 상태/닉네임이 바뀌면 invalidate 후 DB 의 최신 값 사용 (토큰을 다시 발급하지 않아도 반영)
+        user_repo.get_user_by_email.return_value = Mock(id=7, email="jwt@example.com", nickname="renamed", status=False)
+        await service.invalidate_principal(self.user.email)
+        with pytest.raises(UnauthorizedException):
+            await service.get_user_by_token(token, Mock())
+        user_repo.get_user_by_email.assert_awaited_once()
+
+    async def test_revoked_tokens_are_rejected(self):
+        redis = FakeRedis()
+
+        async def get_redis():
+            return redis
+
+        user_repo = AsyncMock()
+        user_repo.get_user_by_email.return_value = self.user
+        service = UserService(user_repo, token_versions=TokenVersionStore(redis_getter=get_redis))
+        old_token = await service.issue_jwt(self.user)
+
+        await service.revoke_tokens(self.user.id)
+        with pytest.raises(TokenExpiredException):
+            await service.get_user_by_token(old_token, Mock())
+
+        new_token = await service.issue_jwt(self.user)
+        assert (await service.get_user_by_token(new_token, Mock())).id == self.user.id
+
+    async def test_redis_outage_fails_closed(self):
+        redis = FakeRedis()
+        available = True
+
+        async def get_redis():
+            if not available:
+                raise ConnectionError("Redis down")
+            return redis
+
+        service = UserService(AsyncMock(), token_versions=TokenVersionStore(redis_getter=get_redis))
+        token = await service.issue_jwt(self.user)
+
+        available = False
+        service.token_versions = TokenVersionStore(redis_getter=get_redis)
+        with pytest.raises(TokenStoreUnavailableException):
+            await service.issue_jwt(self.user)     # ver=0 으로 대신 발급하지 않음
+        with pytest.raises(TokenStoreUnavailableException):
+            await service.revoke_tokens(self.user.id)
+        with pytest.raises(TokenStoreUnavailableException):
+            await service.get_user_by_token(token, Mock())     # 폐기 여부를 확인할 수 없는 토큰도 받지 않음
+
+    async def test_change_password_rolls_back_when_revocation_fails(self, async_client: AsyncClient):
+        from core.di import get_token_version_store
+        from service.auth.principal import InMemoryTokenVersionStore
+        from src.main import app
+
+        user_data = {**TestUserAuth.user_data, "email": "revoke@example.com", "nickname": "revoke_user", "phone_num": "01055551111"}
+        await async_client.post("/users/sign-up", json=user_data)
+        login = await async_client.post("/users/log-in", json={"email": user_data["email"], "password": user_data["password"]})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        store = InMemoryTokenVersionStore()
+        store.bump = AsyncMock(side_effect=TokenStoreUnavailableException())
+        app.dependency_overrides[get_token_version_store] = lambda: store
+
+        response = await async_client.patch("/users/change-pw", json={
+            "current_password": user_data["password"],
+            "new_password": "newpassword1",
+            "confirm_password": "newpassword1"
+        }, headers=headers)
+        assert response.status_code == 503
+        assert response.json()["code"] == "TOKEN_STORE_UNAVAILABLE"
+
+        # 토큰을 폐기하지 못했으므로 비밀번호 변경도 롤백
+        login = await async_client.post("/users/log-in", json={"email": user_data["email"], "password": user_data["password"]})
+        assert login.status_code == 200
+
+    async def test_verified_token_cache(self, monkeypatch):
+        metrics.reset()
+        redis = FakeRedis()
+
+        async def get_redis():
+            return redis
+
+        service = UserService(AsyncMock(), token_versions=TokenVersionStore(redis_getter=get_redis),
+                              token_cache=VerifiedTokenCache(max_size=1))
+        token = await service.issue_jwt(self.user)
+
+        decode = Mock(wraps=jwt.decode)
+        monkeypatch.setattr("service.user_service.jwt.decode", decode)
+        await service.get_user_by_token(token, Mock())
+        await service.get_user_by_token(token, Mock())
+        assert decode.call_count == 1   # 두 번째는 서명 검증 없이 캐시 사용
+        assert metrics.snapshot()["counters"] == {"jwt_cache_miss": 1, "jwt_cache_hit": 1}
+
+        # 캐시에 있어도 폐기된 토큰은 거부
+        await service.revoke_tokens(self.user.id)
+        with pytest.raises(TokenExpiredException):
+            await service.get_user_by_token(token, Mock())
+
+        # 만료된 클레임은 캐시에서 제외
+        service.token_cache.set(token, {**service.token_cache.get(token), "exp": 0})
+        assert service.token_cache.get(token) is None
+
+
+class TestPasswordHasher:
+
+    async def test_hash_and_verify_off_event_loop(self):
+        metrics.reset()
+        hasher = PasswordHasher(max_workers=1)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0)
+                ticks += 1
+
+        hashed, _ = await asyncio.gather(hasher.hash("password123"), ticker())
+        assert ticks == 5   # 해싱 중에도 다른 코루틴이 실행됨
+
+        assert await hasher.verify("password123", hashed)
+        assert not await hasher.verify("wrong-password", hashed)
+
+        timings = metrics.snapshot()["timings"]
+        assert timings["bcrypt_queue_wait_seconds"]["count"] == 3
+        assert timings["bcrypt_verify_seconds"]["count"] == 2
+        hasher.shutdown()
+
+
+class TestAuthRateLimit:
+    SIGN_UP_URL = "/users/sign-up"
+    LOG_IN_URL = "/users/log-in"
+
+    async def test_log_in_throttled_before_hashing(self, async_client: AsyncClient):
+        login_data = {"email": "victim@example.com", "password": "wrongpassword"}
+        for _ in range(5):
+            response = await async_client.post(self.LOG_IN_URL, json=login_data)
+            assert response.status_code == 401
+
+        metrics.reset()
+        response = await async_client.post(self.LOG_IN_URL, json=login_data)
+
+        assert response.status_code == 429
+        assert response.json()["code"] == "TOO_MANY_REQUESTS"
+        assert 1 <= int(response.headers["Retry-After"]) <= 60
+        assert "bcrypt_verify_seconds" not in metrics.snapshot()["timings"]    # 해싱 전에 거절
+
+        # 다른 계정은 IP 제한에 걸리기 전까지 그대로 처리
+        other = await async_client.post(self.LOG_IN_URL, json={"email": "other@example.com", "password": "wrongpassword"})
+        assert other.status_code == 401
+
+    async def test_sliding_window_expires(self, monkeypatch):
+        from service.auth import rate_limiter as module
+
+        now = 1000.0
+        monkeypatch.setattr(module.time, "monotonic", lambda: now)
+        limiter = module.InMemoryRateLimiter()
+
+        assert await limiter.hit("key", limit=2, window=60) is None
+        now += 30
+        assert await limiter.hit("key", limit=2, window=60) is None
+        assert await limiter.hit("key", limit=2, window=60) == 30   # 첫 요청이 윈도우를 벗어날 때까지
+
+        now += 30
+        assert await limiter.hit("key", limit=2, window=60) is None
+
+
+class TestUserAvailability:
+    AVAILABILITY_URL = "/users/availability"
+
+    async def test_bloom_positions_have_no_false_negatives(self):
+        size, hash_count = bloom_parameters(1000, 0.01)
+        bits = set()
+        values = [f"user{i}@example.com" for i in range(1000)]
+        for value in values:
+            bits.update(bloom_positions(value, size, hash_count))
+
+        assert all(bits.issuperset(bloom_positions(value, size, hash_count)) for value in values)
+        false_positives = sum(bits.issuperset(bloom_positions(f"other{i}@example.com", size, hash_count)) for i in range(10000))
+        assert false_positives < 300    # 오탐률 1% 기준 여유 있게
+
+    async def test_filter_is_shared_between_workers(self, async_client: AsyncClient, test_session):
+        from core.di import get_user_availability
+        from database.repository.user_repository import UserRepository
+        from src.main import app
+
+        redis = FakeRedis()
+
+        async def get_redis():
+            return redis
+
+        # 가입은 worker_a, 조회는 worker_b 가 처리해도 같은 Redis 비트맵을 봄
+        worker_a = UserAvailability(1000, 0.01, redis_getter=get_redis)
+        worker_b = UserAvailability(1000, 0.01, redis_getter=get_redis)
+        assert await worker_a.rebuild(UserRepository(test_session)) == 0
+        assert await worker_b.rebuild(UserRepository(test_session)) is None     # 이미 구성됨
+
+        app.dependency_overrides[get_user_availability] = lambda: worker_a
+        await async_client.post(TestUserAuth.SIGN_UP_URL, json=TestUserAuth.user_data)
+        app.dependency_overrides[get_user_availability] = lambda: worker_b
+
+        statements = []
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = test_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            free = await async_client.get(self.AVAILABILITY_URL, params={"email": "new@example.com", "nickname": "새닉네임"})
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        assert free.json() == {"email": True, "nickname": True}
+        assert not [s for s in statements if "FROM users" in s]     # 필터에 없으면 DB 조회 없음
+
+        taken = await async_client.get(self.AVAILABILITY_URL, params={
+            "email": TestUserAuth.user_data["email"],
+            "nickname": "새닉네임",
+            "phone_num": TestUserAuth.user_data["phone_num"],   # 전화번호는 조회 불가 (무시)
+        })
+        assert taken.json() == {"email": False, "nickname": True}
+
+    async def test_unbuilt_or_unavailable_filter_falls_back_to_db(self, async_client: AsyncClient, test_session):
+        from database.repository.user_repository import UserRepository
+
+        await async_client.post(TestUserAuth.SIGN_UP_URL, json=TestUserAuth.user_data)
+
+        redis = FakeRedis()
+
+        async def get_redis():
+            return redis
+
+        availability = UserAvailability(1000, 0.01, redis_getter=get_redis)
+        assert await availability.might_exist("email", "anything@example.com")    # 구성 전에는 항상 DB 확인
+
+        assert await availability.rebuild(UserRepository(test_session), batch_size=1) == 1
+        assert await availability.might_exist("email", TestUserAuth.user_data["email"])
+        assert await availability.might_exist("nickname", TestUserAuth.user_data["nickname"])
+
+        # 필터 반영에 실패하면 필터를 믿지 않음
+        redis.setbit = AsyncMock(side_effect=ConnectionError("Redis down"))
+        await availability.add("late@example.com", "late_user")
+        assert await redis.exists("user_bloom:ready") == 0
+
+        # 그동안 통과 답변은 /users/availability 에서 DB 로 확인된 값 (conftest 기본값: Redis 없음)
+        response = await async_client.get(self.AVAILABILITY_URL, params={"email": TestUserAuth.user_data["email"]})
+        assert response.json() == {"email": False}
+
+    async def test_sign_up_checks_duplicates_in_one_query(self, async_client: AsyncClient, test_session):
+        await async_client.post(TestUserAuth.SIGN_UP_URL, json=TestUserAuth.user_data)
+
+        duplicate = {**TestUserAuth.user_data, "email": "other@example.com", "checked_password": "different123"}
+
+        statements = []
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        engine = test_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = await async_client.post(TestUserAuth.SIGN_UP_URL, json=duplicate)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        # 닉네임과 전화번호가 모두 중복이어도 우선순위대로 닉네임 에러
+        assert response.status_code == 409
+        assert response.json()["code"] == "NICKNAME_CONFLICT"
+        assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+
+
+class TestSocialState:
+
+    async def test_state_is_consumed_once(self, monkeypatch):
+        from core.connection import RedisClient
+        from exception.social_auth_exception import InvalidStateException
+        from service.auth.base_social_auth_service import BaseSocialAuthService
+
+        redis = FakeRedis()
+
+        async def get_redis():
+            return redis
+
+        monkeypatch.setattr(RedisClient, "get_redis", get_redis)
+        service = BaseSocialAuthService(user_service=Mock(), user_repo=Mock(), platform="naver")
+
+        await service.save_state("state-1")
+        await service.validate_state("state-1")
+        assert redis.store == {}    # 조회와 함께 삭제
+
+        with pytest.raises(InvalidStateException):
+            await service.validate_state("state-1")
+
+    async def test_token_exchange_reuses_provider_client(self):
+        import httpx
+        from service.auth.kakao_auth_service import KakaoAuthService
+        from service.auth.oauth_http import OAuthHttpClients
+
+        hosts = []
+
+        def handler(request: httpx.Request):
+            hosts.append(request.url.host)
+            if request.url.path == "/oauth/token":
+                return httpx.Response(200, json={"access_token": "kakao-token"})
+            return httpx.Response(200, json={"id": 1, "kakao_account": {}})
+
+        http_clients = OAuthHttpClients(transport=httpx.MockTransport(handler))
+        service = KakaoAuthService(user_service=Mock(), user_repo=Mock(), http_clients=http_clients)
+        other = KakaoAuthService(user_service=Mock(), user_repo=Mock(), http_clients=http_clients)
+
+        token = await service.get_token("code")
+        await other.get_user_info(token["access_token"])
+
+        assert hosts == ["kauth.kakao.com", "kapi.kakao.com"]
+        assert service.http is other.http   # 요청마다 새 클라이언트를 만들지 않음
+
+        await http_clients.close()
+        assert service.http.is_closed